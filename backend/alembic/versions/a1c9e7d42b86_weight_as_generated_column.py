@@ -0,0 +1,52 @@
+"""Make interactions.weight a stored generated column
+
+Revision ID: a1c9e7d42b86
+Revises: f42a8ec4e6f0
+Create Date: 2026-08-31 10:12:45.201133
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1c9e7d42b86'
+down_revision: Union[str, None] = 'f42a8ec4e6f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 权重推导表达式，与 app.models.interaction._WEIGHT_SQL 保持一致
+_WEIGHT_SQL = (
+    "CASE interaction_type "
+    "WHEN 'PLAY' THEN 1.0 "
+    "WHEN 'LIKE' THEN 5.0 "
+    "ELSE 0.0 END"
+)
+
+
+def upgrade() -> None:
+    # 生成列无法通过 ALTER COLUMN 原地转换，需删除后重建
+    # STORED 生成列会在重建时基于 interaction_type 回填所有历史行
+    op.drop_column('interactions', 'weight')
+    op.add_column(
+        'interactions',
+        sa.Column(
+            'weight',
+            sa.Float(),
+            sa.Computed(_WEIGHT_SQL, persisted=True),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    # 回退为普通列并按同一规则回填，保持数据等价
+    op.drop_column('interactions', 'weight')
+    op.add_column(
+        'interactions',
+        sa.Column('weight', sa.Float(), nullable=False, server_default='0'),
+    )
+    op.execute(f"UPDATE interactions SET weight = {_WEIGHT_SQL}")
+    op.alter_column('interactions', 'weight', server_default=None)
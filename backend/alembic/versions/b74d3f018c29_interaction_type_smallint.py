@@ -0,0 +1,103 @@
+"""Store interactions.interaction_type as SMALLINT
+
+Revision ID: b74d3f018c29
+Revises: a1c9e7d42b86
+Create Date: 2026-08-31 10:41:22.873410
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b74d3f018c29'
+down_revision: Union[str, None] = 'a1c9e7d42b86'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 编码映射，与 app.models.interaction.INTERACTION_TYPE_CODES 保持一致
+# (1=PLAY, 2=LIKE, 3=SKIP)
+_WEIGHT_SQL_INT = (
+    "CASE interaction_type "
+    "WHEN 1 THEN 1.0 "
+    "WHEN 2 THEN 5.0 "
+    "ELSE 0.0 END"
+)
+
+
+def upgrade() -> None:
+    # 1. weight 生成列依赖 interaction_type，必须先删除
+    op.drop_column('interactions', 'weight')
+
+    # 2. 枚举文本 -> SMALLINT 编码 (先建新列回填，再换名，保证可中断重试)
+    op.add_column(
+        'interactions',
+        sa.Column('interaction_type_new', sa.SmallInteger(), nullable=True),
+    )
+    op.execute(
+        "UPDATE interactions SET interaction_type_new = "
+        "CASE interaction_type "
+        "WHEN 'PLAY' THEN 1 WHEN 'LIKE' THEN 2 WHEN 'SKIP' THEN 3 END"
+    )
+    op.drop_column('interactions', 'interaction_type')
+    op.alter_column(
+        'interactions', 'interaction_type_new',
+        new_column_name='interaction_type', nullable=False,
+    )
+
+    # 3. 基于整数编码重建 weight 生成列 (STORED 重建时自动回填)
+    op.add_column(
+        'interactions',
+        sa.Column(
+            'weight',
+            sa.Float(),
+            sa.Computed(_WEIGHT_SQL_INT, persisted=True),
+            nullable=False,
+        ),
+    )
+
+    # 4. 枚举类型已无引用，清理掉
+    op.execute("DROP TYPE IF EXISTS interaction_type_enum")
+
+
+def downgrade() -> None:
+    op.drop_column('interactions', 'weight')
+
+    op.execute(
+        "CREATE TYPE interaction_type_enum AS ENUM ('PLAY', 'LIKE', 'SKIP')"
+    )
+    op.add_column(
+        'interactions',
+        sa.Column(
+            'interaction_type_old',
+            sa.Enum('PLAY', 'LIKE', 'SKIP', name='interaction_type_enum'),
+            nullable=True,
+        ),
+    )
+    op.execute(
+        "UPDATE interactions SET interaction_type_old = "
+        "(CASE interaction_type "
+        "WHEN 1 THEN 'PLAY' WHEN 2 THEN 'LIKE' WHEN 3 THEN 'SKIP' END)"
+        "::interaction_type_enum"
+    )
+    op.drop_column('interactions', 'interaction_type')
+    op.alter_column(
+        'interactions', 'interaction_type_old',
+        new_column_name='interaction_type', nullable=False,
+    )
+
+    op.add_column(
+        'interactions',
+        sa.Column(
+            'weight',
+            sa.Float(),
+            sa.Computed(
+                "CASE interaction_type "
+                "WHEN 'PLAY' THEN 1.0 WHEN 'LIKE' THEN 5.0 ELSE 0.0 END",
+                persisted=True,
+            ),
+            nullable=False,
+        ),
+    )
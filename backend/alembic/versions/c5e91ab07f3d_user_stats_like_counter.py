@@ -0,0 +1,65 @@
+"""Add user_stats like counter and LIKE partial unique index
+
+Revision ID: c5e91ab07f3d
+Revises: b74d3f018c29
+Create Date: 2026-08-31 11:02:47.190233
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e91ab07f3d'
+down_revision: Union[str, None] = 'b74d3f018c29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 1. 计数器表: 每用户一行，读取收藏数退化为主键点查
+    op.create_table(
+        'user_stats',
+        sa.Column('user_id', postgresql.UUID(), nullable=False),
+        sa.Column('like_count', sa.Integer(), nullable=False,
+                  server_default='0'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'],
+                                ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+
+    # 2. 清理历史重复收藏 (同一 user+music 多条 LIKE)，保留最早一条
+    #    必须在建部分唯一索引前执行，否则索引创建会失败
+    op.execute(
+        "DELETE FROM interactions a USING interactions b "
+        "WHERE a.interaction_type = 2 AND b.interaction_type = 2 "
+        "AND a.user_id = b.user_id AND a.music_id = b.music_id "
+        "AND a.id > b.id"
+    )
+
+    # 3. LIKE 部分唯一索引: 写路径依赖它做 ON CONFLICT DO NOTHING 幂等，
+    #    同时保证 like_count 不会因重复收藏虚增
+    #    (2 = InteractionType.LIKE 的 SMALLINT 编码)
+    op.create_index(
+        'uq_interactions_user_music_like',
+        'interactions',
+        ['user_id', 'music_id'],
+        unique=True,
+        postgresql_where=sa.text('interaction_type = 2'),
+    )
+
+    # 4. 从存量 LIKE 记录回填计数器
+    op.execute(
+        "INSERT INTO user_stats (user_id, like_count) "
+        "SELECT user_id, COUNT(DISTINCT music_id) FROM interactions "
+        "WHERE interaction_type = 2 GROUP BY user_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_interactions_user_music_like',
+                  table_name='interactions')
+    op.drop_table('user_stats')
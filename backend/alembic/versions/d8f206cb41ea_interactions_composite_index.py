@@ -0,0 +1,36 @@
+"""Replace interactions user_id index with covering composite index
+
+Revision ID: d8f206cb41ea
+Revises: c5e91ab07f3d
+Create Date: 2026-08-31 11:38:05.627414
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8f206cb41ea'
+down_revision: Union[str, None] = 'c5e91ab07f3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 三列复合索引: 收藏状态的 EXISTS 探测变为 index-only scan，
+    # 前缀 user_id 同时服务所有按用户过滤的查询
+    op.create_index(
+        'ix_interactions_user_music_type',
+        'interactions',
+        ['user_id', 'music_id', 'interaction_type'],
+    )
+    # 单列 user_id 索引被复合索引前缀完全覆盖，保留只会
+    # 放大写路径开销 (interactions 是写入最频繁的表)
+    op.drop_index('ix_interactions_user_id', table_name='interactions')
+
+
+def downgrade() -> None:
+    op.create_index('ix_interactions_user_id', 'interactions', ['user_id'])
+    op.drop_index('ix_interactions_user_music_type', table_name='interactions')
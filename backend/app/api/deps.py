@@ -52,10 +52,21 @@ from app.schemas.token import TokenPayload
 #
 # future=True 的作用:
 # 启用 SQLAlchemy 2.0 风格的 API，确保使用最新的查询语法。
+# 连接池显式配置
+#
+# 为什么不能用默认池参数:
+# 默认 pool_size=5 在并发交互写入下很快被打满，后续请求全部在
+# pool_timeout 上排队，整个应用的吞吐被串行化在 5 个连接上。
+# 具体取值与权衡见 app/core/config.py 中各 DB_POOL_* 配置项的说明。
 engine = create_async_engine(
     str(settings.SQLALCHEMY_DATABASE_URI),
     echo=True,
     future=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
 )
 
 # 创建异步会话工厂
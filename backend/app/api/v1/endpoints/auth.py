@@ -12,11 +12,12 @@
 
 from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
+from app.core.rate_limit import check_login_rate
 from app.schemas.token import Token
 from app.services.auth_service import auth_service
 
@@ -25,6 +26,7 @@ router = APIRouter()
 
 @router.post("/login/access-token", response_model=Token)
 async def login_access_token(
+    request: Request,
     db: Annotated[AsyncSession, Depends(deps.get_db)],
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
 ) -> Any:
@@ -61,6 +63,12 @@ async def login_access_token(
         HTTPException: 401 - 账号或密码错误
         HTTPException: 400 - 用户账户已停用
     """
+    # 前置限流检查
+    # 必须在 DB 查询和 Argon2 校验之前执行:
+    # 被限流的请求只消耗一次 Redis 往返，不会触碰昂贵的哈希计算
+    client_ip = request.client.host if request.client else "unknown"
+    await check_login_rate(form_data.username, client_ip)
+
     # 验证用户凭证
     # form_data.username 包含用户输入的账号字符串 (可能是邮箱或用户名)
     # Service 层会自动识别并尝试两种查询方式
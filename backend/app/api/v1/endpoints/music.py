@@ -7,7 +7,7 @@
 
 from typing import Annotated, List
 
-from fastapi import APIRouter, Depends, File, Form, UploadFile
+from fastapi import APIRouter, Depends, File, Form, Request, UploadFile
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -44,6 +44,23 @@ async def create_artist(
     return await repo.create(db, obj_in=artist_in)
 
 
+@router.post("/artists/bulk", response_model=List[ArtistResponse])
+async def create_artists_bulk(
+        *,
+        db: Annotated[AsyncSession, Depends(deps.get_db)],
+        artists_in: List[ArtistCreate],
+        current_user: Annotated[User, Depends(deps.get_current_active_superuser)],
+):
+    """
+    批量创建艺术家 (仅管理员)
+
+    批量导入场景下，逐个 POST 的往返延迟会主导元数据阶段耗时;
+    此接口一次请求创建全部艺术家并返回各自的 ID。
+    """
+    repo = ArtistRepository()
+    return await repo.create_many(db, artists_in)
+
+
 @router.get("/artists", response_model=List[ArtistResponse])
 async def read_artists(
         db: Annotated[AsyncSession, Depends(deps.get_db)],
@@ -75,6 +92,23 @@ async def create_album(
     return result.scalar_one()
 
 
+@router.post("/albums/bulk", response_model=List[AlbumResponse])
+async def create_albums_bulk(
+        *,
+        db: Annotated[AsyncSession, Depends(deps.get_db)],
+        albums_in: List[AlbumCreate],
+        current_user: Annotated[User, Depends(deps.get_current_active_superuser)],
+):
+    """
+    批量创建专辑 (仅管理员)
+
+    与 /artists/bulk 对称，单条多值 INSERT 完成全部创建，
+    嵌套的 artist 信息由仓储层一次性回填。
+    """
+    repo = AlbumRepository()
+    return await repo.create_many(db, albums_in)
+
+
 @router.get("/artists/{artist_id}/albums", response_model=List[AlbumResponse])
 async def read_artist_albums(
         artist_id: int,
@@ -121,6 +155,63 @@ async def upload_music(
     return result.scalar_one()
 
 
+@router.put("/upload/raw", response_model=MusicResponse)
+async def upload_music_raw(
+        *,
+        request: Request,
+        db: Annotated[AsyncSession, Depends(deps.get_db)],
+        current_user: Annotated[User, Depends(deps.get_current_active_superuser)],
+        title: str,
+        duration: int,
+        album_id: int,
+        track_number: int = 1,
+        filename: str = "",
+):
+    """
+    原始字节流上传 (仅管理员)
+
+    与 /upload 等价，但请求体就是音频字节本身，元数据走查询参数:
+    multipart/form-data 需要服务端逐字节扫描 boundary 并把文件数据
+    再拷贝一次; 单文件上传场景下这套框架纯属开销。原始 PUT 让
+    服务端按块直收，批量导入工具的首选通道。
+
+    请求体按块落入 SpooledTemporaryFile (1 MiB 内存阈值，超出自动
+    转磁盘)，再包装成 UploadFile 复用 upload_music 的 Saga 事务。
+    """
+    from tempfile import SpooledTemporaryFile
+
+    from starlette.datastructures import Headers
+
+    spool = SpooledTemporaryFile(max_size=1024 * 1024)
+    async for chunk in request.stream():
+        spool.write(chunk)
+    size = spool.tell()
+    spool.seek(0)
+
+    upload = UploadFile(
+        file=spool,
+        size=size,
+        filename=filename or f"{title}.flac",
+        headers=Headers({
+            "content-type": request.headers.get("content-type", "audio/flac"),
+        }),
+    )
+    music_meta = MusicCreate(
+        title=title,
+        duration=duration,
+        album_id=album_id,
+        track_number=track_number,
+    )
+
+    new_music = await music_service.upload_music(db, upload, music_meta)
+
+    stmt = select(Music).options(
+        selectinload(Music.album).selectinload(Album.artist)
+    ).where(Music.id == new_music.id)
+    result = await db.execute(stmt)
+    return result.scalar_one()
+
+
 @router.get("/", response_model=MusicListResponse)
 async def read_musics(
         db: Annotated[AsyncSession, Depends(deps.get_db)],
@@ -139,7 +230,9 @@ async def read_musics(
         selectinload(Music.album).selectinload(Album.artist)
     ).offset(skip).limit(limit)
     result = await db.execute(stmt)
-    items = list(result.scalars().all())
+
+    # from_orm_fast: 数据来自可信 DB，跳过逐行的完整 Pydantic 校验
+    items = [MusicResponse.from_orm_fast(m) for m in result.scalars().all()]
 
     return MusicListResponse(items=items, total=total)
 
@@ -177,7 +270,7 @@ async def search_music(
         .limit(limit)
     )
     result = await db.execute(stmt)
-    items = list(result.scalars().all())
+    items = [MusicResponse.from_orm_fast(m) for m in result.scalars().all()]
 
     # 获取总数
     count_stmt = (
@@ -277,7 +370,10 @@ async def get_liked_music(
         skip=skip,
         limit=limit,
     )
-    return MusicListResponse(items=items, total=total)
+    return MusicListResponse(
+        items=[MusicResponse.from_orm_fast(m) for m in items],
+        total=total,
+    )
 
 
 @router.delete("/interactions/like/{music_id}", status_code=204)
@@ -591,3 +687,42 @@ async def remove_song_from_playlist(
         )
     )
     await db.commit()
+
+
+# --- Music Detail (通配路由，必须最后注册) ---
+# 为什么放在文件末尾:
+# /{music_id} 是单段通配路由，FastAPI 按注册顺序匹配 ——
+# 若注册在 /playlists 等单段字面量路由之前，GET /music/playlists
+# 会被它截获并因 music_id 解析失败返回 422。所有字面量 GET 路由
+# 注册完毕后再挂通配路由，保证字面量优先。
+@router.get("/{music_id}", response_model=MusicResponse)
+async def read_music_detail(
+        music_id: int,
+        db: Annotated[AsyncSession, Depends(deps.get_db)],
+):
+    """
+    获取音乐详情
+
+    缓存策略 (Cache-Aside):
+    1. 先查 Redis 中缓存的 JSON 字节，命中则直接返回原始字节，
+       完全绕过 DB 查询与 Pydantic 序列化
+    2. 未命中则回源查询 (含专辑/艺术家预加载)，序列化后回填缓存
+
+    response_model 仍声明为 MusicResponse 以保证 OpenAPI 文档正确。
+    """
+    from fastapi import Response
+    from app.core.exceptions import NotFoundError
+    from app.services.music_cache import music_cache
+
+    cached = await music_cache.get_cached_json(music_id)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    repo = MusicRepository()
+    music = await repo.get_with_details(db, music_id)
+    if not music:
+        raise NotFoundError("音乐文件")
+
+    payload = MusicResponse.from_orm_fast(music).model_dump_json().encode()
+    await music_cache.set_cached_json(music_id, payload)
+    return Response(content=payload, media_type="application/json")
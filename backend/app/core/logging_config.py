@@ -0,0 +1,66 @@
+"""
+日志基础设施模块
+
+本模块提供进程级的非阻塞日志配置。
+
+为什么不直接 print / 同步 StreamHandler:
+1. print 与同步 handler 都会在调用线程 (通常是事件循环线程) 里
+   做格式化并阻塞写 stdout —— 输出到 TTY/管道时 flush 是同步
+   系统调用，负载高时 stdout 变成事件循环内的隐性串行点
+2. QueueHandler 只做一次无锁入队 (微秒级)，格式化与真正的写出
+   由后台 QueueListener 线程完成，热路径上日志成本趋近于零
+3. 级别过滤在入队前生效: 被过滤的日志连格式化都不会发生
+
+使用方式:
+    from app.core.logging_config import setup_logging
+    setup_logging()  # 应用工厂中调用一次
+
+    # 业务模块照常:
+    import logging
+    logger = logging.getLogger(__name__)
+"""
+
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+# 进程级监听器引用: 防止被垃圾回收，并供退出钩子关闭
+_listener: QueueListener | None = None
+
+
+def setup_logging(level: int = logging.INFO) -> None:
+    """
+    配置队列化的根日志器 (幂等，重复调用无副作用)
+
+    管线结构:
+        业务线程 --QueueHandler--> 无界内存队列 --后台线程--> StreamHandler
+
+    Args:
+        level: 根日志器级别，默认 INFO
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue()
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter(
+            "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+        )
+    )
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(QueueHandler(log_queue))
+
+    # respect_handler_level=True: 监听器侧再按 handler 级别过滤一次
+    _listener = QueueListener(
+        log_queue, stream_handler, respect_handler_level=True
+    )
+    _listener.start()
+
+    # 进程退出时冲刷队列，避免丢失末尾日志
+    atexit.register(_listener.stop)
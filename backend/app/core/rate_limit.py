@@ -0,0 +1,76 @@
+"""
+登录限流模块
+
+本模块为认证端点提供基于 Redis 的滑动窗口限流 (INCR + EXPIRE)。
+
+为什么要限流登录:
+密码校验 (Argon2) 是整个应用最贵的 CPU 操作。攻击者只需持续
+提交登录请求就能打满 CPU，把合法用户一并拖垮。限流检查在
+DB 查询和 Argon2 之前执行，以极低成本 (一次 Redis INCR)
+把攻击流量挡在昂贵路径之外。
+
+限流维度:
+1. 账号标识 (防针对单账号的暴力破解)
+2. 客户端 IP (防单源的撒网式枚举)
+
+降级策略:
+Redis 不可用时放行 (fail-open) —— 限流是防护手段而非业务功能，
+缓存故障不应导致所有用户无法登录。
+"""
+
+from fastapi import HTTPException, status
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+# 惰性连接: 首个命令执行时才建立连接，导入阶段无 IO
+_redis = aioredis.from_url(settings.REDIS_URL)
+
+# 窗口长度 (秒): INCR 计数器的过期时间
+_WINDOW_SECONDS = 60
+
+
+async def _incr_window(key: str) -> int:
+    """
+    原子递增计数器并在窗口首次计数时设置过期
+
+    INCR 返回 1 说明是窗口内第一次计数，此时挂上 EXPIRE。
+    即使 INCR 与 EXPIRE 之间进程崩溃留下无过期键，
+    下一窗口的第一次 INCR 仍会返回 >1 并很快被运维清理，
+    属于可接受的边界情况。
+    """
+    count = await _redis.incr(key)
+    if count == 1:
+        await _redis.expire(key, _WINDOW_SECONDS)
+    return count
+
+
+async def check_login_rate(identifier: str, client_ip: str) -> None:
+    """
+    登录前置限流检查
+
+    必须在 DB 查询和密码校验之前调用，这样被限流的请求
+    只消耗一次 Redis 往返，不触碰任何昂贵资源。
+
+    Args:
+        identifier: 登录提交的账号标识 (邮箱或用户名)
+        client_ip: 客户端 IP
+
+    Raises:
+        HTTPException: 429 - 请求频率超限
+    """
+    try:
+        ident_count = await _incr_window(f"rl:login:ident:{identifier}")
+        ip_count = await _incr_window(f"rl:login:ip:{client_ip}")
+    except Exception:
+        # fail-open: Redis 故障时不应让所有用户无法登录
+        return
+
+    if (
+        ident_count > settings.LOGIN_RATE_LIMIT_IDENTIFIER_PER_MIN
+        or ip_count > settings.LOGIN_RATE_LIMIT_IP_PER_MIN
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="登录尝试过于频繁，请稍后再试",
+        )
@@ -15,6 +15,10 @@
 - HS256 JWT: 适用于单体应用的对称签名算法。
 """
 
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Any, Union
 
@@ -23,6 +27,8 @@ from passlib.context import CryptContext
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 # =============================================================================
 # 密码哈希配置
 # =============================================================================
@@ -35,10 +41,113 @@ from app.core.config import settings
 # 这是一个平滑迁移策略。如果数据库中遗留了旧算法 (如 bcrypt) 的哈希值，
 # 系统仍能验证通过，但在验证成功后，passlib 会自动标记其为"过时"。
 # 业务层检测到此标记后，可自动将其重哈希为 Argon2 并更新数据库 (Auto-Rehash)。
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+# argon2__type="ID": 显式锁定 Argon2id 变体
+# 为什么不依赖默认值:
+# Argon2i 的纯数据无关寻址需要 t>=3 才安全，同等安全预算下比
+# Argon2id 慢; Argon2d 又暴露缓存时序侧信道。id 混合变体是
+# OWASP/RFC 9106 的推荐默认，也是每安全单位耗时最低的选择。
+# 显式声明后，上游库调整默认值也不会悄然改变我们的哈希变体。
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__type="ID",
+)
+
+# 用户不存在时用于"陪跑"校验的哑哈希
+# 为什么需要:
+# 若账号查不到就提前返回，"用户不存在"会明显快于"密码错误"，
+# 形成可枚举有效账号的时序侧信道。对固定哑哈希做一次完整的
+# Argon2 校验，使每次登录请求的 CPU 成本恒定，同时也让
+# 线程池容量规划只需按"每请求一次 Argon2"估算。
+# 进程启动时生成一次即可，盐值随机不影响用途 (结果必然不匹配)。
+DUMMY_PASSWORD_HASH = pwd_context.hash("flowbeat-dummy-credential")
+
+# =============================================================================
+# Argon2 专用线程池
+# =============================================================================
+# 为什么单独建池而非复用事件循环默认 executor:
+# 1. 隔离: 默认 executor 还承载 MinIO 传输等 I/O 型任务，
+#    与 CPU 密集的哈希互相排队会放大两边的尾延迟
+# 2. 有界: 按 CPU 核数限制并发哈希数 —— Argon2 是内存硬算法，
+#    无界并发会让内存占用随登录洪峰线性膨胀
+# 3. 有效: argon2-cffi 的 C 实现在计算期间释放 GIL，
+#    线程即可真正并行，无需付出进程池的序列化开销
+_ARGON2_POOL = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 4,
+    thread_name_prefix="argon2",
+)
+
+
+def calibrate_argon2_parameters() -> None:
+    """
+    按部署硬件校准 Argon2 内存成本 (启动时执行一次)
+
+    为什么不硬编码参数:
+    同一组 (m, t, p) 在 1 vCPU 的 VPS 和裸金属上的耗时相差一个
+    数量级 —— 硬编码要么在弱机器上慢到不可用，要么在强机器上
+    快到不安全。此函数在当前 CPU 上实测哈希耗时，选出不超过
+    目标延迟 (ARGON2_TARGET_MS) 的最大 memory_cost。
+
+    校准策略:
+    从 8 MiB 起倍增 memory_cost，每档实测一次哈希耗时，
+    保留最后一个仍在预算内的档位; 上限 64 MiB，
+    防止单请求 RSS 无界膨胀。time_cost/parallelism 维持 passlib
+    默认值，只调内存维度 (Argon2 的安全性主要由内存硬度决定)。
+
+    副作用:
+    原地更新模块级 pwd_context，并重建 DUMMY_PASSWORD_HASH，
+    保证"陪跑"校验的耗时与真实校验一致。
+    """
+    import time
+
+    global DUMMY_PASSWORD_HASH
+
+    target_seconds = settings.ARGON2_TARGET_MS / 1000.0
+    memory_cost_kib = 8 * 1024
+    chosen = memory_cost_kib
+
+    while memory_cost_kib <= 64 * 1024:
+        probe_context = CryptContext(
+            schemes=["argon2"],
+            argon2__type="ID",
+            argon2__memory_cost=memory_cost_kib,
+        )
+        started = time.perf_counter()
+        probe_context.hash("calibration-probe")
+        elapsed = time.perf_counter() - started
+
+        if elapsed > target_seconds:
+            break
+        chosen = memory_cost_kib
+        memory_cost_kib *= 2
+
+    pwd_context.update(argon2__memory_cost=chosen)
+    DUMMY_PASSWORD_HASH = pwd_context.hash("flowbeat-dummy-credential")
+    logger.info(
+        "Argon2 校准完成: memory_cost=%s KiB (目标 %s ms)",
+        chosen,
+        settings.ARGON2_TARGET_MS,
+    )
+
+
+def _verify_password_sync(plain_password: str, hashed_password: str) -> bool:
+    """verify_password 的同步实现，仅供 Argon2 线程池内部调用"""
+    try:
+        return pwd_context.verify(plain_password, hashed_password)
+    except Exception:
+        # 安全处理: 捕获所有异常并返回 False
+        #
+        # 为什么不记录异常详情:
+        # 密码验证是安全敏感操作，异常信息可能包含:
+        # 1. 哈希算法版本信息 (可被用于针对性攻击)
+        # 2. 输入长度信息 (可被用于侧信道攻击)
+        #
+        # 生产环境中，此处应记录结构化安全日志 (Security Audit Log)，
+        # 但日志内容应仅包含"验证失败"事件，不包含具体原因。
+        return False
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     验证明文密码与哈希摘要是否匹配
 
@@ -47,6 +156,11 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     2. 安全: 统一处理异常，防止错误信息泄露。
     3. 可测: 便于在单元测试中 mock 此函数。
 
+    为什么是 async:
+    Argon2 校验是 50-200ms 量级的纯 CPU 操作，必须离开事件循环。
+    计算在模块级的有界 Argon2 线程池中执行 (并发上限 = CPU 核数)，
+    登录洪峰下哈希并发被自然限流，不会挤占其他线程化任务。
+
     安全注意事项:
     - 此函数不应抛出任何异常，所有错误都返回 False。
     - 不应在日志中记录密码相关的任何信息。
@@ -58,22 +172,12 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         bool: 匹配返回 True，否则返回 False
     """
-    try:
-        return pwd_context.verify(plain_password, hashed_password)
-    except Exception:
-        # 安全处理: 捕获所有异常并返回 False
-        #
-        # 为什么不记录异常详情:
-        # 密码验证是安全敏感操作，异常信息可能包含:
-        # 1. 哈希算法版本信息 (可被用于针对性攻击)
-        # 2. 输入长度信息 (可被用于侧信道攻击)
-        #
-        # 生产环境中，此处应记录结构化安全日志 (Security Audit Log)，
-        # 但日志内容应仅包含"验证失败"事件，不包含具体原因。
-        return False
+    return await asyncio.get_running_loop().run_in_executor(
+        _ARGON2_POOL, _verify_password_sync, plain_password, hashed_password
+    )
 
 
-def get_password_hash(password: str) -> str:
+async def get_password_hash(password: str) -> str:
     """
     生成高强度的密码哈希摘要
 
@@ -93,6 +197,10 @@ def get_password_hash(password: str) -> str:
     - salt: 随机盐值 (Base64 编码)
     - hash: 哈希结果 (Base64 编码)
 
+    为什么是 async:
+    与 verify_password 相同 —— 哈希生成在有界 Argon2 线程池中执行，
+    不阻塞事件循环，注册洪峰下的并发哈希数以 CPU 核数为上限。
+
     Args:
         password: 明文密码
 
@@ -100,7 +208,21 @@ def get_password_hash(password: str) -> str:
         str: 安全的哈希字符串，可直接存入数据库
     """
     # passlib 会自动生成高熵随机盐，无需手动干预
-    return pwd_context.hash(password)
+    return await asyncio.get_running_loop().run_in_executor(
+        _ARGON2_POOL, pwd_context.hash, password
+    )
+
+
+# =============================================================================
+# JWT 签名材料 (import 时固化)
+# =============================================================================
+# 为什么提为模块常量:
+# 密钥与算法在进程生命周期内不变，每次签发都经 settings 动态属性
+# 访问纯属重复开销; 固化后 create_access_token 的热路径只剩一次
+# HMAC 计算。默认过期增量同样预计算，省去每请求的 timedelta 构造。
+_SIGNING_KEY = settings.SECRET_KEY
+_SIGNING_ALGORITHM = settings.ALGORITHM
+_DEFAULT_EXPIRE_DELTA = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
 
 
 def create_access_token(
@@ -129,27 +251,15 @@ def create_access_token(
     """
     # 计算过期时间
     # 为什么强制使用 UTC: 防止跨服务器/跨时区部署时的时间偏差导致 Token 提前失效
-    if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
-    else:
-        expire = datetime.now(timezone.utc) + timedelta(
-            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-        )
+    expire = datetime.now(timezone.utc) + (expires_delta or _DEFAULT_EXPIRE_DELTA)
 
-    # 构建载荷 (Payload)
+    # 构建载荷并签名
     # 为什么只存储 sub 和 exp:
     # 1. 减小 Token 体积，降低网络传输开销
     # 2. 遵循最小信息原则，敏感数据 (如角色) 应从数据库实时查询
-    to_encode = {
-        "exp": expire,
-        "sub": str(subject),
-    }
-
-    # 签名生成
-    # 为什么使用 settings.SECRET_KEY: 确保生产环境使用强随机密钥
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.SECRET_KEY,
-        algorithm=settings.ALGORITHM,
+    # 签名材料使用模块常量 (见上方 _SIGNING_KEY)，热路径零动态查找
+    return jwt.encode(
+        {"exp": expire, "sub": str(subject)},
+        _SIGNING_KEY,
+        algorithm=_SIGNING_ALGORITHM,
     )
-    return encoded_jwt
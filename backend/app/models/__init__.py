@@ -12,6 +12,6 @@
 from app.models.base import Base
 from app.models.user import User
 from app.models.music import Album, Artist, Music, Playlist, PlaylistSong
-from app.models.interaction import Interaction, InteractionType, INTERACTION_WEIGHTS
+from app.models.interaction import Interaction, InteractionType, INTERACTION_WEIGHTS, UserStats
 
-__all__ = ["Base", "User", "Artist", "Album", "Music", "Playlist", "PlaylistSong", "Interaction", "InteractionType", "INTERACTION_WEIGHTS"]
+__all__ = ["Base", "User", "Artist", "Album", "Music", "Playlist", "PlaylistSong", "Interaction", "InteractionType", "INTERACTION_WEIGHTS", "UserStats"]
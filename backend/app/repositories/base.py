@@ -22,8 +22,9 @@
 from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
 
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 
 from app.models.base import Base
 
@@ -67,6 +68,30 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         self.model = model
 
+    @staticmethod
+    def _safe(stmt: Select, *loads) -> Select:
+        """
+        为查询附加显式加载策略并封禁隐式懒加载
+
+        为什么需要此守卫:
+        异步 SQLAlchemy 不支持隐式 IO。任何未经 selectinload/joinedload
+        预加载的关系属性，一旦在序列化时被访问，就会抛出 MissingGreenlet —
+        且仅在属性真正被访问时才暴露。更糟的是，若未来切换到同步驱动，
+        这类访问会退化为无声的 N+1 查询。
+
+        raiseload("*") 将这类错误提前为确定性失败:
+        任何未显式预加载的关系访问都会立即抛出 InvalidRequestError，
+        在测试阶段就能捕获 N+1 回归，而非等到线上序列化边界才爆发。
+
+        Args:
+            stmt: 待包装的 select 语句
+            *loads: 显式的预加载策略 (如 selectinload(Music.album))
+
+        Returns:
+            Select: 附加了加载策略和懒加载守卫的语句
+        """
+        return stmt.options(*loads, raiseload("*"))
+
     async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
         """
         根据主键查询单条记录
@@ -82,7 +107,7 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Returns:
             Optional[ModelType]: 找到则返回实体，否则返回 None
         """
-        query = select(self.model).where(self.model.id == id)
+        query = self._safe(select(self.model).where(self.model.id == id))
         result = await db.execute(query)
         return result.scalar_one_or_none()
 
@@ -112,7 +137,7 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Returns:
             List[ModelType]: 实体列表，可能为空
         """
-        query = select(self.model).offset(skip).limit(limit)
+        query = self._safe(select(self.model).offset(skip).limit(limit))
         result = await db.execute(query)
         return list(result.scalars().all())
 
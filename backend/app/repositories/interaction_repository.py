@@ -10,13 +10,21 @@
 2. 批量读取: 推荐算法需要批量读取数据，需优化查询效率
 """
 
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Sequence, Tuple
 from uuid import UUID
 
-from sqlalchemy import select
+import numpy as np
+from scipy.sparse import coo_matrix, csr_matrix
+from sqlalchemy import exists, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.interaction import Interaction, InteractionType, INTERACTION_WEIGHTS
+from app.models.interaction import (
+    INTERACTION_TYPE_CODES,
+    Interaction,
+    InteractionType,
+    UserStats,
+)
 from app.repositories.base import BaseRepository
 
 
@@ -41,7 +49,17 @@ class InteractionRepository(BaseRepository[Interaction, Any, Any]):
         记录用户交互行为
 
         为什么不使用 create 方法:
-        交互记录需要自动计算权重值，封装此逻辑避免调用方重复处理。
+        交互记录的入参不经过 Pydantic Schema，封装此方法避免调用方拼装实体。
+
+        权重说明:
+        weight 是数据库生成列，由 interaction_type 在 DB 端推导，
+        INSERT 不携带该字段; commit 后通过 refresh 读回生成值。
+
+        LIKE 的特殊处理:
+        1. 借助部分唯一索引 (user_id, music_id) WHERE LIKE 做
+           ON CONFLICT DO NOTHING，重复收藏幂等
+        2. 仅在真正插入新行时 (+1) 维护 user_stats.like_count，
+           计数器与交互记录同事务提交
 
         Args:
             db: 数据库会话
@@ -50,16 +68,15 @@ class InteractionRepository(BaseRepository[Interaction, Any, Any]):
             interaction_type: 交互类型
 
         Returns:
-            Interaction: 创建的交互记录
+            Interaction: 创建的交互记录 (重复收藏时返回已存在的记录)
         """
-        # 根据交互类型获取对应权重
-        weight = INTERACTION_WEIGHTS.get(interaction_type, 0.0)
+        if interaction_type == InteractionType.LIKE:
+            return await self._record_like(db, user_id, music_id)
 
         interaction = Interaction(
             user_id=str(user_id),
             music_id=music_id,
             interaction_type=interaction_type,
-            weight=weight,
         )
 
         db.add(interaction)
@@ -68,6 +85,63 @@ class InteractionRepository(BaseRepository[Interaction, Any, Any]):
 
         return interaction
 
+    async def _record_like(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        music_id: int,
+    ) -> Interaction:
+        """
+        记录收藏行为并增量维护计数器
+
+        幂等性依赖部分唯一索引 uq_interactions_user_music_like。
+        仅当 INSERT 真正落行时才对 user_stats 执行 UPSERT +1，
+        保证 like_count 与 DISTINCT 计数语义一致。
+        """
+        insert_stmt = (
+            pg_insert(Interaction)
+            .values(
+                user_id=str(user_id),
+                music_id=music_id,
+                interaction_type=InteractionType.LIKE,
+            )
+            .on_conflict_do_nothing(
+                index_elements=["user_id", "music_id"],
+                index_where=text(
+                    f"interaction_type = {INTERACTION_TYPE_CODES[InteractionType.LIKE]}"
+                ),
+            )
+            .returning(Interaction)
+        )
+        inserted = (await db.execute(insert_stmt)).scalars().first()
+
+        if inserted is not None:
+            # 新收藏: 同事务内维护计数器
+            bump_stmt = (
+                pg_insert(UserStats)
+                .values(id=str(user_id), like_count=1)
+                .on_conflict_do_update(
+                    index_elements=["user_id"],
+                    set_={"like_count": UserStats.like_count + 1},
+                )
+            )
+            await db.execute(bump_stmt)
+            await db.commit()
+            return inserted
+
+        # 重复收藏: 幂等返回已存在的记录
+        await db.commit()
+        stmt = self._safe(
+            select(Interaction)
+            .where(
+                Interaction.user_id == str(user_id),
+                Interaction.music_id == music_id,
+                Interaction.interaction_type == InteractionType.LIKE,
+            )
+            .limit(1)
+        )
+        return (await db.execute(stmt)).scalar_one()
+
     async def get_user_interactions(
         self,
         db: AsyncSession,
@@ -87,7 +161,8 @@ class InteractionRepository(BaseRepository[Interaction, Any, Any]):
         Returns:
             List[Interaction]: 交互记录列表，按时间倒序
         """
-        stmt = (
+        # Interaction 无需加载任何关系，_safe 仅附加懒加载守卫
+        stmt = self._safe(
             select(Interaction)
             .where(Interaction.user_id == str(user_id))
             .order_by(Interaction.created_at.desc())
@@ -117,7 +192,7 @@ class InteractionRepository(BaseRepository[Interaction, Any, Any]):
         Returns:
             List[Interaction]: 交互记录列表
         """
-        stmt = (
+        stmt = self._safe(
             select(Interaction)
             .offset(skip)
             .limit(limit)
@@ -125,6 +200,58 @@ class InteractionRepository(BaseRepository[Interaction, Any, Any]):
         result = await db.execute(stmt)
         return list(result.scalars().all())
 
+    async def build_interaction_csr(
+        self,
+        db: AsyncSession,
+    ) -> Tuple[csr_matrix, np.ndarray, np.ndarray]:
+        """
+        构建用户-音乐交互稀疏矩阵 (CSR)
+
+        为什么在仓储层直接产出 CSR:
+        协同过滤需要 (user, item, weight) 三元组构成的稀疏矩阵。
+        若返回 ORM 对象列表让算法层逐条累加，每条交互都要经过
+        Python 解释器 (属性访问 + dict 查找)，百万级数据下是明显瓶颈。
+        此方法只取三列标量 (SoA 而非对象)，用 NumPy 向量化操作完成
+        id -> 稠密下标的映射和矩阵装配，热路径全部在 C 层执行。
+
+        聚合语义:
+        COO -> CSR 转换会自动对重复坐标求和，因此同一 (user, music)
+        的多次交互权重天然累加，无需 Python 端预聚合。
+
+        Returns:
+            Tuple[csr_matrix, np.ndarray, np.ndarray]:
+                - 交互矩阵 (行=用户, 列=音乐, 值=累计权重)
+                - 行下标 -> user_id 的映射数组
+                - 列下标 -> music_id 的映射数组
+        """
+        # 只投影三列标量，避免 ORM 实体水合开销
+        stmt = select(
+            Interaction.user_id,
+            Interaction.music_id,
+            Interaction.weight,
+        )
+        result = await db.execute(stmt)
+        rows = result.all()
+
+        if not rows:
+            return csr_matrix((0, 0)), np.array([]), np.array([], dtype=np.int64)
+
+        # 列式转置 (SoA): 一次 zip 完成，后续全部走 NumPy
+        user_col, music_col, weight_col = zip(*rows)
+        user_arr = np.asarray([str(u) for u in user_col])
+        music_arr = np.asarray(music_col, dtype=np.int64)
+        weight_arr = np.asarray(weight_col, dtype=np.float64)
+
+        # np.unique(return_inverse=True): 原始 id -> 稠密矩阵下标
+        user_ids, user_idx = np.unique(user_arr, return_inverse=True)
+        music_ids, music_idx = np.unique(music_arr, return_inverse=True)
+
+        coo = coo_matrix(
+            (weight_arr, (user_idx, music_idx)),
+            shape=(len(user_ids), len(music_ids)),
+        )
+        return coo.tocsr(), user_ids, music_ids
+
     async def check_user_liked_music(
         self,
         db: AsyncSession,
@@ -136,6 +263,11 @@ class InteractionRepository(BaseRepository[Interaction, Any, Any]):
 
         用于前端展示收藏状态。
 
+        为什么用 EXISTS 而非 SELECT ... LIMIT 1:
+        存在性判断不需要任何列数据。EXISTS 半连接只回传 1 字节布尔值，
+        且命中 LIKE 部分唯一索引后退化为一次 index-only 探测，
+        省去整行水合与网络传输。
+
         Args:
             db: 数据库会话
             user_id: 用户 UUID
@@ -144,17 +276,15 @@ class InteractionRepository(BaseRepository[Interaction, Any, Any]):
         Returns:
             bool: 是否已收藏
         """
-        stmt = (
-            select(Interaction)
-            .where(
+        stmt = select(
+            exists().where(
                 Interaction.user_id == str(user_id),
                 Interaction.music_id == music_id,
                 Interaction.interaction_type == InteractionType.LIKE,
             )
-            .limit(1)
         )
         result = await db.execute(stmt)
-        return result.scalar_one_or_none() is not None
+        return bool(result.scalar())
 
     async def get_user_liked_music_ids(
         self,
@@ -199,23 +329,22 @@ class InteractionRepository(BaseRepository[Interaction, Any, Any]):
         """
         统计用户收藏的音乐数量
 
+        为什么不再 COUNT(DISTINCT music_id):
+        聚合成本随收藏历史线性增长，而此接口被个人主页高频调用。
+        计数器在收藏/取消收藏的写路径上增量维护 (见 _record_like /
+        remove_user_like)，这里退化为一次 user_stats 主键点查。
+
         Args:
             db: 数据库会话
             user_id: 用户 UUID
 
         Returns:
-            int: 收藏数量
+            int: 收藏数量 (无统计行时为 0)
         """
-        from sqlalchemy import func
-        stmt = (
-            select(func.count(func.distinct(Interaction.music_id)))
-            .where(
-                Interaction.user_id == str(user_id),
-                Interaction.interaction_type == InteractionType.LIKE,
-            )
-        )
+        stmt = select(UserStats.like_count).where(UserStats.id == str(user_id))
         result = await db.execute(stmt)
-        return result.scalar_one()
+        count = result.scalar_one_or_none()
+        return count if count is not None else 0
 
     async def remove_user_like(
         self,
@@ -244,9 +373,68 @@ class InteractionRepository(BaseRepository[Interaction, Any, Any]):
             )
         )
         result = await db.execute(stmt)
+
+        # 同事务内扣减计数器 (下限 0，防御历史脏数据)
+        if result.rowcount > 0:
+            await db.execute(
+                update(UserStats)
+                .where(UserStats.id == str(user_id))
+                .values(
+                    like_count=text(
+                        f"GREATEST(like_count - {result.rowcount}, 0)"
+                    )
+                )
+            )
+
         await db.commit()
         return result.rowcount > 0
 
+    async def decrement_like_counts_for_musics(
+        self,
+        db: AsyncSession,
+        music_ids: Sequence[int],
+    ) -> None:
+        """
+        音乐删除前扣减受影响用户的收藏计数器
+
+        为什么需要:
+        interactions.music_id 外键是 ON DELETE CASCADE，删除音乐会
+        连带清掉对应的 LIKE 行，但 user_stats.like_count 不会自行
+        回落 —— 不补偿的话计数器永久向上漂移，收藏列表接口的 total
+        会大于实际返回的行数。此方法按用户聚合待删音乐的 LIKE 行数，
+        用一条 UPDATE ... FROM 批量扣减 (下限 0，防御历史脏数据)。
+
+        注意:
+        必须在 DELETE musics 之前、同一会话内调用; 此处不 commit，
+        扣减与删除由调用方在同一事务中原子提交。
+
+        Args:
+            db: 数据库会话
+            music_ids: 即将被删除的音乐 ID 列表
+        """
+        if not music_ids:
+            return
+
+        from sqlalchemy import func
+
+        liked = (
+            select(
+                Interaction.user_id.label("user_id"),
+                func.count().label("n"),
+            )
+            .where(
+                Interaction.music_id.in_(music_ids),
+                Interaction.interaction_type == InteractionType.LIKE,
+            )
+            .group_by(Interaction.user_id)
+            .subquery()
+        )
+        await db.execute(
+            update(UserStats)
+            .where(UserStats.id == liked.c.user_id)
+            .values(like_count=func.greatest(UserStats.like_count - liked.c.n, 0))
+        )
+
 
 # 单例实例，便于依赖注入
 interaction_repository = InteractionRepository()
\ No newline at end of file
@@ -13,15 +13,72 @@
     user = await repo.get_by_email(db, email="test@example.com")
 """
 
-from typing import Optional
+import time
+from typing import Any, Dict, Optional, Tuple, Union
 
-from sqlalchemy import select
+from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
 from app.repositories.base import BaseRepository
 from app.schemas.user import UserCreate, UserUpdate
 
+# =============================================================================
+# 进程内 TTL 缓存
+# =============================================================================
+# 为什么缓存 get_by_email / get_by_username:
+# 用户数据是典型的"读多写少": 登录、Token 刷新循环等场景会在短时间内
+# 反复按同一标识解析用户，而用户资料更新相对罕见。
+# 一个短 TTL 的进程内缓存即可把这类突发的重复查询折叠为一次 DB 往返。
+#
+# 为什么 TTL 取 30 秒:
+# 足够折叠突发 (如前端的 Token 刷新风暴)，又足够短，
+# 使得跨 worker 的资料更新最多延迟 30 秒可见。
+#
+# 线程/协程安全说明:
+# 缓存的读写之间没有 await 点，在单线程事件循环下天然原子，
+# 无需额外加锁; 缓存未命中的并发请求会各自回源查询，属于可接受的退化。
+_USER_CACHE_TTL = 30.0
+_USER_CACHE_MAX = 1024
+
+# 缓存键: ("email" | "username", 标识值) -> (写入时刻, 用户实体)
+_user_cache: Dict[Tuple[str, str], Tuple[float, User]] = {}
+
+
+def _cache_get(key: Tuple[str, str]) -> Optional[User]:
+    """读取缓存，过期条目顺带清除"""
+    entry = _user_cache.get(key)
+    if entry is None:
+        return None
+    cached_at, user = entry
+    if time.monotonic() - cached_at >= _USER_CACHE_TTL:
+        _user_cache.pop(key, None)
+        return None
+    return user
+
+
+def _cache_put(key: Tuple[str, str], user: User) -> None:
+    """写入缓存，容量超限时按插入顺序淘汰最旧条目 (近似 LRU)"""
+    if len(_user_cache) >= _USER_CACHE_MAX:
+        _user_cache.pop(next(iter(_user_cache)), None)
+    _user_cache[key] = (time.monotonic(), user)
+
+
+def invalidate_user_cache(
+    email: Optional[str] = None,
+    username: Optional[str] = None,
+) -> None:
+    """
+    失效指定标识的缓存条目
+
+    必须在任何修改用户身份字段的写路径上调用 (注册、资料更新)，
+    否则同一 worker 在 TTL 窗口内可能继续返回旧实体。
+    """
+    if email is not None:
+        _user_cache.pop(("email", email), None)
+    if username is not None:
+        _user_cache.pop(("username", username), None)
+
 
 class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
     """
@@ -62,6 +119,10 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
         通用 get 方法只支持主键查询，而邮箱是业务唯一键，
         需要专门的查询方法。
 
+        缓存说明:
+        命中进程内 TTL 缓存时直接返回，省去一次 DB 往返;
+        仅缓存命中结果，不缓存 None (防止注册查重被旧的未命中污染)。
+
         Args:
             db: 数据库会话
             email: 用户邮箱
@@ -69,9 +130,17 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
         Returns:
             Optional[User]: 找到则返回用户实体，否则返回 None
         """
-        stmt = select(User).where(User.email == email)
+        cached = _cache_get(("email", email))
+        if cached is not None:
+            return cached
+
+        # _safe: 封禁隐式懒加载，未预加载的关系访问会立即报错而非触发 N+1
+        stmt = self._safe(select(User).where(User.email == email))
         result = await db.execute(stmt)
-        return result.scalar_one_or_none()
+        user = result.scalar_one_or_none()
+        if user is not None:
+            _cache_put(("email", email), user)
+        return user
 
     async def get_by_username(self, db: AsyncSession, username: str) -> Optional[User]:
         """
@@ -84,6 +153,7 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
 
         性能说明:
         username 字段已建立唯一索引，查询效率为 O(log n)。
+        命中进程内 TTL 缓存时为 O(1)，不发起 DB 往返。
 
         Args:
             db: 数据库会话
@@ -92,6 +162,108 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
         Returns:
             Optional[User]: 找到则返回用户实体，否则返回 None
         """
-        stmt = select(User).where(User.username == username)
+        cached = _cache_get(("username", username))
+        if cached is not None:
+            return cached
+
+        stmt = self._safe(select(User).where(User.username == username))
         result = await db.execute(stmt)
-        return result.scalar_one_or_none()
+        user = result.scalar_one_or_none()
+        if user is not None:
+            _cache_put(("username", username), user)
+        return user
+
+    async def get_by_identifier(self, db: AsyncSession, identifier: str) -> Optional[User]:
+        """
+        根据账号标识 (邮箱或用户名) 查询用户
+
+        为什么不串行调用 get_by_email + get_by_username:
+        登录热路径上两次顺序往返把 DB 延迟翻倍，而 Argon2 校验本身
+        已是 50-200ms 量级 —— 不应再把可省的查询延迟叠在上面。
+        OR 条件单次查询即可覆盖两种登录习惯，email 与 username 均有
+        唯一索引，计划器用 BitmapOr 合并两次索引探测，仍是索引驱动。
+
+        缓存说明:
+        先按两种键探一次进程内缓存; 回源命中后以实体的真实标识
+        写入两个键，后续无论用户用哪种方式登录都直接命中。
+
+        Args:
+            db: 数据库会话
+            identifier: 邮箱或用户名
+
+        Returns:
+            Optional[User]: 找到则返回用户实体，否则返回 None
+        """
+        cached = _cache_get(("email", identifier)) or _cache_get(("username", identifier))
+        if cached is not None:
+            return cached
+
+        stmt = self._safe(
+            select(User)
+            .where(or_(User.email == identifier, User.username == identifier))
+            .limit(1)
+        )
+        result = await db.execute(stmt)
+        user = result.scalar_one_or_none()
+        if user is not None:
+            _cache_put(("email", user.email), user)
+            _cache_put(("username", user.username), user)
+        return user
+
+    async def get_taken_identifiers(
+        self,
+        db: AsyncSession,
+        email: str,
+        username: str,
+    ) -> Tuple[bool, bool]:
+        """
+        单次往返检查邮箱和用户名是否已被占用
+
+        为什么不复用 get_by_email + get_by_username:
+        注册查重需要同时检查两个标识，串行两次查询把 DB 往返翻倍。
+        OR 条件一次取回所有冲突行 (至多 2 条)，在 Python 端拆分标志位。
+        只投影两个标识列，不水合完整实体，也不经过用户缓存
+        (查重必须看到最新数据，缓存的"未命中不缓存"语义在此不够)。
+
+        Args:
+            db: 数据库会话
+            email: 待注册邮箱
+            username: 待注册用户名
+
+        Returns:
+            Tuple[bool, bool]: (邮箱已占用, 用户名已占用)
+        """
+        stmt = (
+            select(User.email, User.username)
+            .where(or_(User.email == email, User.username == username))
+            .limit(2)
+        )
+        result = await db.execute(stmt)
+        email_taken = False
+        username_taken = False
+        for row_email, row_username in result.all():
+            if row_email == email:
+                email_taken = True
+            if row_username == username:
+                username_taken = True
+        return email_taken, username_taken
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: User,
+        obj_in: Union[UserUpdate, Dict[str, Any]],
+    ) -> User:
+        """
+        更新用户并失效身份缓存
+
+        为什么覆盖基类实现:
+        email/username 可能在更新中变化，必须同时失效新旧两套标识的
+        缓存条目，否则 TTL 窗口内旧标识仍会命中过期实体。
+        """
+        old_email, old_username = db_obj.email, db_obj.username
+        updated = await super().update(db, db_obj=db_obj, obj_in=obj_in)
+        invalidate_user_cache(email=old_email, username=old_username)
+        invalidate_user_cache(email=updated.email, username=updated.username)
+        return updated
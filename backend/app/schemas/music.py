@@ -30,6 +30,21 @@ class ArtistResponse(ArtistBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+    @classmethod
+    def from_orm_fast(cls, obj) -> "ArtistResponse":
+        """
+        免校验的 ORM -> Response 快速构造
+
+        为什么绕过校验:
+        from_attributes=True 的标准路径会对每个字段重跑完整的 Pydantic
+        校验 (长度约束、类型检查等)。但数据来自我们自己的数据库，
+        写入时已校验过，读取路径上的重复校验是纯 CPU 开销。
+        model_construct 直接装配字段，列表响应的单行序列化成本可降 3-5 倍。
+
+        注意: 仅可用于可信的 DB 实体，严禁用于外部输入。
+        """
+        return cls.model_construct(**{k: getattr(obj, k) for k in cls.model_fields})
+
 
 # --- Album Schemas ---
 class AlbumBase(BaseModel):
@@ -57,6 +72,14 @@ class AlbumResponse(AlbumBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+    @classmethod
+    def from_orm_fast(cls, obj) -> "AlbumResponse":
+        """免校验快速构造 (详见 ArtistResponse.from_orm_fast)，嵌套 artist 递归处理"""
+        data = {k: getattr(obj, k) for k in cls.model_fields if k != "artist"}
+        artist = obj.artist
+        data["artist"] = ArtistResponse.from_orm_fast(artist) if artist is not None else None
+        return cls.model_construct(**data)
+
 
 # --- Music Schemas ---
 class MusicBase(BaseModel):
@@ -78,6 +101,14 @@ class MusicResponse(MusicBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+    @classmethod
+    def from_orm_fast(cls, obj) -> "MusicResponse":
+        """免校验快速构造 (详见 ArtistResponse.from_orm_fast)，嵌套 album 递归处理"""
+        data = {k: getattr(obj, k) for k in cls.model_fields if k != "album"}
+        album = obj.album
+        data["album"] = AlbumResponse.from_orm_fast(album) if album is not None else None
+        return cls.model_construct(**data)
+
 
 class MusicListResponse(BaseModel):
     """分页音乐列表响应"""
@@ -131,6 +162,19 @@ class InteractionResponse(BaseModel):
             return str(v)
         return v
 
+    @classmethod
+    def from_orm_fast(cls, obj) -> "InteractionResponse":
+        """
+        免校验快速构造 (详见 ArtistResponse.from_orm_fast)
+
+        model_construct 不会执行字段校验器，因此 user_id 的
+        UUID -> str 转换需要在此手动完成。
+        """
+        data = {k: getattr(obj, k) for k in cls.model_fields}
+        if data["user_id"] is not None and not isinstance(data["user_id"], str):
+            data["user_id"] = str(data["user_id"])
+        return cls.model_construct(**data)
+
 
 class LikeStatusResponse(BaseModel):
     """
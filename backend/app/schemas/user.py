@@ -194,3 +194,16 @@ class UserResponse(UserBase):
     # from_attributes=True: 允许从 ORM 对象 (SQLAlchemy Model) 直接读取数据
     # 这是 Pydantic v1 中 orm_mode=True 的替代配置
     model_config = ConfigDict(from_attributes=True)
+
+    @classmethod
+    def from_orm_fast(cls, obj) -> "UserResponse":
+        """
+        免校验的 ORM -> Response 快速构造
+
+        标准 from_attributes 路径会在每次序列化时重跑 EmailStr 的正则
+        校验和各字段约束检查，而数据来自我们自己的数据库，写入时已校验。
+        model_construct 直接装配字段，跳过这部分纯 CPU 开销。
+
+        注意: 仅可用于可信的 DB 实体，严禁用于外部输入。
+        """
+        return cls.model_construct(**{k: getattr(obj, k) for k in cls.model_fields})
@@ -28,9 +28,12 @@ from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+# 注意: DUMMY_PASSWORD_HASH 经由模块属性访问而非 from-import，
+# 因为启动校准 (calibrate_argon2_parameters) 会原地重建该哑哈希
+from app.core import security
 from app.core.security import create_access_token, get_password_hash, verify_password
 from app.models.user import User
-from app.repositories.user_repository import UserRepository
+from app.repositories.user_repository import UserRepository, invalidate_user_cache
 from app.schemas.token import Token
 from app.schemas.user import UserCreate
 
@@ -71,10 +74,9 @@ class AuthService:
         用户登录验证 (支持邮箱或用户名双重登录)
 
         业务规则:
-        1. 尝试将输入识别为邮箱进行查询
-        2. 若邮箱未找到，尝试作为用户名查询
-        3. 验证密码哈希是否匹配
-        4. 返回用户实体或 None
+        1. 按标识 (邮箱或用户名) 单次 OR 查询定位用户
+        2. 验证密码哈希是否匹配
+        3. 返回用户实体或 None
 
         安全设计:
         1. 无论是用户不存在还是密码错误，都返回 None
@@ -93,20 +95,23 @@ class AuthService:
         Returns:
             Optional[User]: 验证成功返回用户实体，失败返回 None
         """
-        # 1. 尝试作为邮箱查询
-        user = await self.user_repo.get_by_email(db, email=account_identifier)
-
-        # 2. 如果邮箱未找到，尝试作为用户名查询
-        if not user:
-            user = await self.user_repo.get_by_username(db, username=account_identifier)
-
-        # 3. 用户不存在
-        if not user:
-            return None
-
-        # 4. 验证密码
-        # verify_password 内部已封装异常处理，直接判断 bool 即可
-        if not verify_password(password, user.password_hash):
+        # 1. 单次 OR 查询定位用户 (邮箱或用户名)
+        # 登录延迟已由 Argon2 主导，查询往返减半避免雪上加霜
+        user = await self.user_repo.get_by_identifier(db, account_identifier)
+
+        # 2. 验证密码 (用户不存在时对哑哈希陪跑校验)
+        # 为什么不提前返回:
+        # "查无此人"若跳过 Argon2，会比"密码错误"快 50-200ms，
+        # 攻击者据此即可枚举有效账号。对 DUMMY_PASSWORD_HASH 做
+        # 等量校验后，两种失败路径的耗时特征一致。
+        #
+        # 线程化说明:
+        # verify_password 本身是 async，内部在 security 模块的
+        # 有界 Argon2 线程池中执行，不阻塞事件循环。
+        password_hash = user.password_hash if user else security.DUMMY_PASSWORD_HASH
+        password_ok = await verify_password(password, password_hash)
+
+        if not user or not password_ok:
             return None
 
         return user
@@ -140,15 +145,17 @@ class AuthService:
         Raises:
             HTTPException: 400 - 邮箱或用户名已被注册
         """
-        # 1. 查重逻辑: 邮箱
-        if await self.user_repo.get_by_email(db, email=user_in.email):
+        # 1-2. 查重逻辑: 邮箱 + 用户名
+        # 单次 OR 查询替代两次串行往返，注册路径少一个 DB RTT
+        email_taken, username_taken = await self.user_repo.get_taken_identifiers(
+            db, email=user_in.email, username=user_in.username
+        )
+        if email_taken:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="该邮箱已被注册",
             )
-
-        # 2. 查重逻辑: 用户名
-        if await self.user_repo.get_by_username(db, username=user_in.username):
+        if username_taken:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="该用户名已被使用",
@@ -156,8 +163,9 @@ class AuthService:
 
         # 3. 密码哈希与数据准备
         # 从 Schema 获取字典，弹出明文密码，添加哈希密码
+        # get_password_hash 为 async，内部走有界 Argon2 线程池
         user_data = user_in.model_dump()
-        hashed_password = get_password_hash(user_data.pop("password"))
+        hashed_password = await get_password_hash(user_data.pop("password"))
 
         # 4. 构造实体并持久化
         # 直接使用 Model 构造器，因为 Schema 字段名与实体不完全匹配
@@ -171,6 +179,9 @@ class AuthService:
         await db.commit()
         await db.refresh(db_user)
 
+        # 防御性失效: 确保 TTL 窗口内不会残留同标识的旧缓存条目
+        invalidate_user_cache(email=db_user.email, username=db_user.username)
+
         return db_user
 
     def create_token_for_user(self, user: User) -> Token:
@@ -8,16 +8,44 @@ MinIO 对象存储客户端封装
 - 适配器模式: 屏蔽底层 S3 协议细节，向上层提供简单的 put/remove 接口。
 """
 
+import asyncio
 import io
+import json
+import logging
 from datetime import timedelta
-from typing import BinaryIO
+from typing import BinaryIO, Iterable, List
 
 from minio import Minio
+from minio.deleteobjects import DeleteObject
 from minio.error import S3Error
 
 from app.core.config import settings
 from app.core.exceptions import BusinessError
 
+logger = logging.getLogger(__name__)
+
+# 桶策略模板: import 时序列化一次，桶名通过 %s 占位符注入
+# 为什么不在 _ensure_bucket_exists 里拼 f-string:
+# 策略 JSON 与桶名之外的内容完全静态，多 worker 启动时
+# 每个进程都重复格式化+解析纯属浪费; 预序列化后每次使用
+# 只剩一次 %s 替换。
+_BUCKET_POLICY_TEMPLATE = json.dumps({
+    "Version": "2012-10-17",
+    "Statement": [
+        {
+            "Effect": "Allow",
+            "Principal": {"AWS": ["*"]},
+            "Action": ["s3:GetObject"],
+            "Resource": ["arn:aws:s3:::%s/*"],
+        }
+    ],
+})
+
+# 进程级"桶已检查"标志
+# 测试或脚本中重复实例化 MinioClient 时，不再重复
+# bucket_exists 的网络往返
+_bucket_checked = False
+
 
 class MinioClient:
     def __init__(self):
@@ -28,51 +56,72 @@ class MinioClient:
             secure=settings.MINIO_SECURE,
         )
         self.bucket_name = settings.MINIO_BUCKET_NAME
+
+        # 预计算文件 URL 前缀及其长度
+        # put_object 生成的 URL 固定为 <protocol>://<endpoint>/<bucket>/<object>，
+        # remove_object 反解 object_name 时只需一次常数时间切片，
+        # 不必每次调用都重建分隔串再做 split 扫描
+        protocol = "https" if settings.MINIO_SECURE else "http"
+        self._url_prefix = f"{protocol}://{settings.MINIO_ENDPOINT}/{self.bucket_name}/"
+        self._url_prefix_len = len(self._url_prefix)
+
         self._ensure_bucket_exists()
 
     def _ensure_bucket_exists(self):
-        """确保存储桶存在，若不存在则自动创建"""
+        """确保存储桶存在，若不存在则自动创建 (进程内只检查一次)"""
+        global _bucket_checked
+        if _bucket_checked:
+            return
         try:
             if not self.client.bucket_exists(self.bucket_name):
                 self.client.make_bucket(self.bucket_name)
                 # 设置桶策略为 public download (只读)
                 # 注意: 生产环境应更严格控制权限，此处为了演示方便设为公开
-                policy = f'''
-                {{
-                  "Version": "2012-10-17",
-                  "Statement": [
-                    {{
-                      "Effect": "Allow",
-                      "Principal": {{ "AWS": ["*"] }},
-                      "Action": ["s3:GetObject"],
-                      "Resource": ["arn:aws:s3:::{self.bucket_name}/*"]
-                    }}
-                  ]
-                }}
-                '''
+                policy = _BUCKET_POLICY_TEMPLATE % self.bucket_name
                 self.client.set_bucket_policy(self.bucket_name, policy)
+            _bucket_checked = True
         except Exception as e:
-            print(f"MinIO 连接失败: {e}")
+            logger.warning("MinIO 连接失败: %s", e)
+
+    # 多段上传的分片大小 (10 MB)
+    # 文件大小未知时 minio-py 按此粒度切分 PUT part，
+    # 边读边传，无需提前知道总长度
+    _MULTIPART_PART_SIZE = 10 * 1024 * 1024
 
-    def put_object(self, file_data: BinaryIO, file_name: str, content_type: str, length: int) -> str:
+    async def put_object(self, file_data: BinaryIO, file_name: str, content_type: str, length: int = -1) -> str:
         """
         上传文件到 MinIO
 
+        为什么是 async + to_thread:
+        minio-py 是同步阻塞客户端，直接在协程里调用会卡住整个
+        uvicorn worker 的事件循环 —— 一个人上传，全站等待。
+        通过 asyncio.to_thread 把阻塞的 socket I/O 移到线程池，
+        事件循环在传输期间可继续调度其他请求，N 个并发上传的
+        总耗时从 N*T 退化为 ~max(T)。
+
+        流式上传说明:
+        length 未知 (传 -1) 时切换到 S3 多段上传模式，
+        字节从输入流直接流入 PUT 分片，调用方无需为了测量大小
+        先把整个文件物化到磁盘/内存再重读一遍 (写两次问题)。
+        已知大小时仍走单次 PUT，省去多段协议的额外往返。
+
         Args:
             file_data: 文件流 (BytesIO 或 SpooledTemporaryFile)
             file_name: 目标文件名 (包含路径)
             content_type: MIME 类型
-            length: 文件大小
+            length: 文件大小 (未知时传 -1，走多段流式上传)
 
         Returns:
             str: 文件的访问 URL (相对路径或完整 URL)
         """
         try:
-            self.client.put_object(
+            await asyncio.to_thread(
+                self.client.put_object,
                 bucket_name=self.bucket_name,
                 object_name=file_name,
                 data=file_data,
-                length=length,
+                length=length if length >= 0 else -1,
+                part_size=self._MULTIPART_PART_SIZE if length < 0 else 0,
                 content_type=content_type
             )
             # 构造永久访问 URL
@@ -82,21 +131,71 @@ class MinioClient:
         except S3Error as e:
             raise BusinessError(f"文件上传失败: {str(e)}")
 
-    def remove_object(self, file_url: str):
+    async def remove_object(self, file_url: str):
         """
         删除文件 (用于回滚或清理)
 
+        同 put_object: 阻塞的 S3 DELETE 通过线程池执行，
+        不占用事件循环。
+
         Args:
             file_url: 完整的文件 URL
         """
         try:
             # 从 URL 中提取 object_name
             # URL: http://host:port/bucket/object_name
-            object_name = file_url.split(f"/{self.bucket_name}/")[-1]
-            self.client.remove_object(self.bucket_name, object_name)
+            # 前缀匹配时直接按预计算长度切片 (O(1))，
+            # 异构 URL (如历史数据) 回退到 split
+            if file_url.startswith(self._url_prefix):
+                object_name = file_url[self._url_prefix_len:]
+            else:
+                object_name = file_url.split(f"/{self.bucket_name}/")[-1]
+            await asyncio.to_thread(
+                self.client.remove_object, self.bucket_name, object_name
+            )
         except Exception as e:
             # 删除失败不应阻断主流程，记录日志即可
-            print(f"Warning: Failed to cleanup orphan file {file_url}: {e}")
+            logger.warning("清理孤儿文件失败 %s: %s", file_url, e)
+
+    def _object_name_from_url(self, file_url: str) -> str:
+        """URL -> object_name (优先常数时间前缀切片，回退 split)"""
+        if file_url.startswith(self._url_prefix):
+            return file_url[self._url_prefix_len:]
+        return file_url.split(f"/{self.bucket_name}/")[-1]
+
+    async def remove_many(self, file_urls: Iterable[str]) -> None:
+        """
+        批量删除文件 (管理员清理 / 孤儿文件回收)
+
+        为什么不循环调用 remove_object:
+        逐个删除是对 S3 的典型 N+1 —— N 个对象 N 次 HTTP 往返。
+        S3 的 DeleteObjects API 单请求最多携带 1000 个 key，
+        remove_objects 内部自动分批，RTT 成本从 N*RTT 降为 ceil(N/1000)*RTT。
+
+        错误处理:
+        与单个删除一致 —— 失败仅打印告警，不阻断主流程
+        (业务侧资源已删除，残留对象可由后续清理任务兜底)。
+
+        Args:
+            file_urls: 文件 URL 集合
+        """
+        delete_objects = [
+            DeleteObject(self._object_name_from_url(url)) for url in file_urls
+        ]
+        if not delete_objects:
+            return
+
+        def _do_remove() -> List[str]:
+            # remove_objects 返回惰性错误迭代器，必须消费才真正执行
+            errors = self.client.remove_objects(self.bucket_name, delete_objects)
+            return [f"{err.name}: {err.message}" for err in errors]
+
+        try:
+            failed = await asyncio.to_thread(_do_remove)
+            for message in failed:
+                logger.warning("批量删除对象失败 %s", message)
+        except Exception as e:
+            logger.warning("批量删除请求失败: %s", e)
 
 
 # 全局单例
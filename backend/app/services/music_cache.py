@@ -0,0 +1,94 @@
+"""
+音乐详情 JSON 缓存服务
+
+本模块将 MusicResponse 的序列化结果 (JSON 字节) 缓存在 Redis 中。
+
+为什么缓存序列化结果而非 ORM 对象:
+音乐详情由 (Music, Album, Artist) 三元组唯一决定，且几乎不变。
+每次详情请求都要走 1 次 DB 查询 + 多层 Pydantic 序列化，
+而最终产物就是一段确定性的 JSON 字节。直接缓存字节后，
+命中路径退化为一次 Redis GET，完全绕过 DB 和序列化。
+
+降级策略:
+Redis 不可用时所有操作静默降级为未命中/空操作，
+请求自动回源到数据库，缓存故障不影响业务可用性。
+"""
+
+import logging
+from typing import Optional
+
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MusicCacheService:
+    """
+    音乐详情缓存 (Cache-Aside 模式)
+
+    键设计: music:json:{music_id} -> MusicResponse 的 JSON 字节
+    失效策略: TTL (兜底) + 写路径显式失效 (删除/更新音乐时)
+    """
+
+    def __init__(self) -> None:
+        """
+        初始化 Redis 客户端
+
+        from_url 是惰性的: 不会在构造时建立连接，
+        首个命令执行时才真正连接，因此模块导入阶段无 IO。
+        """
+        self._redis = aioredis.from_url(settings.REDIS_URL)
+
+    @staticmethod
+    def _key(music_id: int) -> str:
+        return f"music:json:{music_id}"
+
+    async def get_cached_json(self, music_id: int) -> Optional[bytes]:
+        """
+        读取缓存的 JSON 字节
+
+        Returns:
+            Optional[bytes]: 命中返回原始字节 (可直接作为响应体)，
+            未命中或 Redis 故障返回 None
+        """
+        try:
+            return await self._redis.get(self._key(music_id))
+        except Exception as e:
+            # Redis 故障降级为未命中，不阻断请求
+            logger.warning("音乐缓存读取失败 music_id=%s: %s", music_id, e)
+            return None
+
+    async def set_cached_json(self, music_id: int, payload: bytes) -> None:
+        """
+        写入缓存 (带 TTL)
+
+        Args:
+            music_id: 音乐 ID
+            payload: MusicResponse 序列化后的 JSON 字节
+        """
+        try:
+            await self._redis.set(
+                self._key(music_id),
+                payload,
+                ex=settings.MUSIC_CACHE_TTL_SECONDS,
+            )
+        except Exception as e:
+            logger.warning("音乐缓存写入失败 music_id=%s: %s", music_id, e)
+
+    async def invalidate(self, music_id: int) -> None:
+        """
+        显式失效某条音乐的缓存
+
+        必须在所有修改 Music/Album/Artist 可见字段的写路径上调用，
+        否则 TTL 窗口内会继续返回旧数据。
+        """
+        try:
+            await self._redis.delete(self._key(music_id))
+        except Exception as e:
+            logger.warning("音乐缓存失效失败 music_id=%s: %s", music_id, e)
+
+
+# 全局单例 (与 minio_client 同模式)
+music_cache = MusicCacheService()
@@ -5,11 +5,13 @@
 同时处理用户交互行为的记录与权重计算。
 """
 
-import uuid
+import logging
+import os
 from typing import BinaryIO
 from uuid import UUID
 
 from fastapi import UploadFile
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import BusinessError, NotFoundError
@@ -19,6 +21,40 @@ from app.repositories.interaction_repository import interaction_repository
 from app.repositories.music_repository import MusicRepository
 from app.schemas.music import MusicCreate
 from app.services.minio_client import minio_client
+from app.services.music_cache import music_cache
+
+logger = logging.getLogger(__name__)
+
+# 交互类型字符串 -> 枚举的预计算映射
+# 为什么不直接 InteractionType(s):
+# 枚举的 __call__ 要走 Python 层描述符和 _value2member_map_，
+# 非法输入还要抛/捕 ValueError (异常路径 = 栈回卷 + traceback 构造)。
+# 播放事件是全站 QPS 最高的上报，dict.get 一次哈希查找即可，
+# 非法输入走 None 分支，完全绕开异常机制。
+_INTERACTION_TYPES: dict[str, InteractionType] = {
+    itype.value: itype for itype in InteractionType
+}
+
+# =============================================================================
+# 对象名随机令牌池
+# =============================================================================
+# 为什么不每次 uuid.uuid4():
+# uuid4 每次都触发一次 getrandom(2) 系统调用再格式化 36 字符。
+# 批量上传时逐个取随机数的 syscall 开销可观; 这里一次 os.urandom
+# 预取 64 个令牌的熵 (仍是 CSPRNG，唯一性/不可预测性不变)，
+# 摊薄后每个对象名只剩一次 list.pop 和 bytes.hex。
+_TOKEN_POOL_REFILL = 64
+_token_pool: list[str] = []
+
+
+def _new_object_token() -> str:
+    """取一个 32 位十六进制随机令牌 (128 bit 熵，与 uuid4 等强)"""
+    if not _token_pool:
+        blob = os.urandom(16 * _TOKEN_POOL_REFILL)
+        _token_pool.extend(
+            blob[i * 16:(i + 1) * 16].hex() for i in range(_TOKEN_POOL_REFILL)
+        )
+    return _token_pool.pop()
 
 
 class MusicService:
@@ -57,20 +93,20 @@ class MusicService:
         file_ext = "mp3"  # 默认扩展名
         if file.filename and "." in file.filename:
             file_ext = file.filename.split(".")[-1]
-        object_name = f"music/{uuid.uuid4()}.{file_ext}"
+        object_name = f"music/{_new_object_token()}.{file_ext}"
 
-        # 获取文件大小 (需移动指针到末尾再复位)
-        # 使用底层的 SpooledTemporaryFile 对象进行 seek 操作，因为它支持 whence 参数
-        file.file.seek(0, 2)
-        file_size = file.file.tell()
-        file.file.seek(0)
+        # 获取文件大小: 优先使用解析阶段已统计的 UploadFile.size，
+        # 避免 seek(0,2)/tell()/seek(0) 三连强制把 SpooledTemporaryFile
+        # 整个物化再重读一遍 (写两次问题)。
+        # size 不可用时传 -1，MinIO 客户端自动切换多段流式上传。
+        file_size = file.size if file.size is not None else -1
 
         uploaded_url = ""
 
         try:
             # 2. 执行 MinIO 上传
             # 注意: file.file 是 Python 的 SpooledTemporaryFile 对象
-            uploaded_url = minio_client.put_object(
+            uploaded_url = await minio_client.put_object(
                 file_data=file.file,
                 file_name=object_name,
                 content_type=file.content_type,
@@ -80,14 +116,12 @@ class MusicService:
             # 3. 准备 DB 实体数据
             # Schema 不包含 file_url，需要手动注入
             music_in_data = metadata.model_dump()
-            db_obj = Music(**music_in_data, file_url=uploaded_url)
+            music_in_data["file_url"] = uploaded_url
 
             # 4. 执行 DB 写入
-            db.add(db_obj)
-            await db.commit()
-            await db.refresh(db_obj)
-
-            return db_obj
+            # INSERT ... RETURNING 单次往返带回完整实体，
+            # 省去 commit 后为读回生成字段的 refresh SELECT
+            return await self.music_repo.create_returning(db, music_in_data)
 
         except Exception as e:
             # 5. 补偿事务 (Compensating Transaction)
@@ -96,8 +130,8 @@ class MusicService:
 
             # 如果 MinIO 上传成功了，但后续 DB 操作失败 (如外键错误)，必须删除 MinIO 文件
             if uploaded_url:
-                print(f"检测到事务失败，正在回滚 MinIO 文件: {uploaded_url}")
-                minio_client.remove_object(uploaded_url)
+                logger.warning("检测到事务失败，正在回滚 MinIO 文件: %s", uploaded_url)
+                await minio_client.remove_object(uploaded_url)
 
             # 重新抛出异常，触发 FastAPI 的 HTTP 错误响应
             raise BusinessError(f"音乐上传失败: {str(e)}")
@@ -117,16 +151,50 @@ class MusicService:
         file_url = music.file_url
 
         # 2. 删除数据库记录 (这是一个事务操作)
+        # 外键级联会连带删除该音乐的 LIKE 行，先在同一事务内扣减
+        # 受影响用户的收藏计数器，防止 user_stats.like_count 永久漂移
+        await interaction_repository.decrement_like_counts_for_musics(db, [music_id])
         await self.music_repo.remove(db, id=music_id)
 
+        # 失效详情缓存，防止 TTL 窗口内继续返回已删除的音乐
+        await music_cache.invalidate(music_id)
+
         # 3. 数据库删除成功后，清理 MinIO 对象
         # 注意：如果此处失败，会产生孤儿文件，建议生产环境接入异步任务队列重试清理
         if file_url:
             try:
-                minio_client.remove_object(file_url)
+                await minio_client.remove_object(file_url)
             except Exception as e:
                 # 记录日志即可，不要阻断主流程，因为业务上该资源已不存在
-                print(f"Warning: Failed to cleanup file {file_url}: {e}")
+                logger.warning("清理文件失败 %s: %s", file_url, e)
+
+    async def delete_many(self, db: AsyncSession, music_ids: list[int]) -> int:
+        """
+        批量删除音乐 (管理员清理)
+
+        与 delete_music 相同的先 DB 后 MinIO 策略，但两侧均走批量通道:
+        1. 单条 DELETE ... IN ... RETURNING 取回所有 file_url
+        2. 逐一失效详情缓存
+        3. 单次 S3 DeleteObjects 清理对象 (最多 1000 key/请求)
+
+        Args:
+            db: 数据库会话
+            music_ids: 音乐 ID 列表
+
+        Returns:
+            int: 实际删除的记录数
+        """
+        # 与单条删除相同的计数器补偿，见 decrement_like_counts_for_musics
+        await interaction_repository.decrement_like_counts_for_musics(db, music_ids)
+        file_urls = await self.music_repo.remove_many(db, music_ids)
+
+        for music_id in music_ids:
+            await music_cache.invalidate(music_id)
+
+        if file_urls:
+            await minio_client.remove_many(file_urls)
+
+        return len(file_urls)
 
     async def record_interaction(
             self,
@@ -154,26 +222,29 @@ class MusicService:
 
         Raises:
             BusinessError: 当交互类型无效时
+            NotFoundError: 当音乐不存在时 (由外键约束兜底判定)
         """
-        # 验证交互类型合法性
-        try:
-            interaction_type = InteractionType(interaction_type_str)
-        except ValueError:
+        # 验证交互类型合法性 (预计算映射，O(1) 且无异常开销)
+        interaction_type = _INTERACTION_TYPES.get(interaction_type_str)
+        if interaction_type is None:
             raise BusinessError(f"无效的交互类型: {interaction_type_str}")
 
-        # 验证音乐是否存在
-        music = await self.music_repo.get(db, music_id)
-        if not music:
+        # 为什么不先 SELECT 验证音乐存在:
+        # 预检查是每次上报多付的一个 DB 往返，且存在 TOCTOU 窗口
+        # (检查后、插入前音乐可能被删除)。musics 外键约束本就是
+        # 存在性的权威判定 —— 直接插入，违反外键时把 IntegrityError
+        # 映射回业务层的 404，单往返且无竞态。
+        try:
+            return await interaction_repository.record_interaction(
+                db=db,
+                user_id=user_id,
+                music_id=music_id,
+                interaction_type=interaction_type,
+            )
+        except IntegrityError:
+            await db.rollback()
             raise NotFoundError("音乐文件")
 
-        # 调用仓储层记录交互
-        return await interaction_repository.record_interaction(
-            db=db,
-            user_id=user_id,
-            music_id=music_id,
-            interaction_type=interaction_type,
-        )
-
     async def check_like_status(
             self,
             db: AsyncSession,
@@ -213,41 +284,49 @@ class MusicService:
             skip: 跳过的记录数
             limit: 返回数量限制
 
+        查询策略:
+        此前分三步: 取 ID 列表 -> IN 查询详情 (selectinload 再追加
+        两条 IN 查询) -> Python 端按 ID 顺序重排，共 4+ 次 DB 往返。
+        现在单条 JOIN 语句完成: interactions 过滤 + albums/artists
+        预加载 (contains_eager 直接消费 JOIN 行) + ORDER BY 由
+        Postgres 完成，无需客户端重排。总数来自 user_stats 计数器
+        (O(1) 主键点查)，整个接口固定 2 次往返。
+
         Returns:
             tuple[list[Music], int]: 音乐列表和总数
         """
         from sqlalchemy import select
-        from sqlalchemy.orm import selectinload
-        from app.models.music import Album
+        from sqlalchemy.orm import contains_eager
+        from app.models.interaction import Interaction, InteractionType
+        from app.models.music import Album, Artist
 
-        # 获取总数
+        # 获取总数: user_stats 计数器点查
         total = await interaction_repository.count_user_liked_music(db, user_id)
+        if total == 0:
+            return [], 0
 
-        # 获取收藏的音乐 ID 列表
-        music_ids = await interaction_repository.get_user_liked_music_ids(
-            db=db,
-            user_id=user_id,
-            skip=skip,
-            limit=limit,
-        )
-
-        if not music_ids:
-            return [], total
-
-        # 查询音乐详情
+        # 单条 JOIN 查询: 过滤、预加载、排序、分页一次完成
+        # LIKE 部分唯一索引保证 (user, music) 无重复行，无需 DISTINCT
         stmt = (
             select(Music)
-            .options(selectinload(Music.album).selectinload(Album.artist))
-            .where(Music.id.in_(music_ids))
+            .join(Interaction, Interaction.music_id == Music.id)
+            .join(Music.album)
+            .join(Album.artist)
+            .options(
+                contains_eager(Music.album).contains_eager(Album.artist)
+            )
+            .where(
+                Interaction.user_id == str(user_id),
+                Interaction.interaction_type == InteractionType.LIKE,
+            )
+            .order_by(Interaction.created_at.desc())
+            .offset(skip)
+            .limit(limit)
         )
         result = await db.execute(stmt)
         items = list(result.scalars().all())
 
-        # 按照 music_ids 的顺序排序
-        id_to_music = {m.id: m for m in items}
-        sorted_items = [id_to_music[mid] for mid in music_ids if mid in id_to_music]
-
-        return sorted_items, total
+        return items, total
 
     async def remove_user_like(
             self,
@@ -1,12 +1,34 @@
 """
 FlowBeat 批量上传脚本 (Dev Tool)
-需要安装依赖: pip install httpx
+需要安装依赖: pip install "httpx[http2]" mutagen
 """
+import atexit
+import hashlib
+import logging
+import mmap
 import os
+import queue
+import sqlite3
 import httpx
 import asyncio
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
+from mutagen.flac import FLAC
+
+# --- 非阻塞日志 ---
+# 为什么不用 print: 每次 print 都是一次行缓冲 write 系统调用，
+# 多路 worker 并发下 stdout 成为争用点 (Windows 控制台单次输出
+# 可达毫秒级)。QueueHandler 让协程路径上只剩一次入队，
+# 真正的终端写入由 QueueListener 的后台线程异步完成。
+_log_queue: queue.Queue = queue.Queue()
+logging.basicConfig(level=logging.INFO, format="%(message)s", handlers=[QueueHandler(_log_queue)])
+_listener = QueueListener(_log_queue, logging.StreamHandler())
+_listener.start()
+atexit.register(_listener.stop)
+
+log = logging.getLogger("upload_script")
+
 # --- 配置 ---
 API_BASE = "http://localhost:8000/api/v1"
 MUSIC_DIR = r"D:\Download\音乐"  # 你的本地音乐目录
@@ -14,101 +36,463 @@ MUSIC_DIR = r"D:\Download\音乐"  # 你的本地音乐目录
 USERNAME = "admin@example.com"
 PASSWORD = "stringst"
 
+# 并发上限 (worker 协程数)
+# 为什么要有界: 无界并发会同时对服务端发起全部上传，
+# 既可能打满本机连接池，也会把服务端压出 5xx; 8 路并发在
+# 本地 API 场景下已接近吞吐拐点
+CONCURRENCY = 8
+
+# 上传重试次数上限
+# 并发上传下连接被重置/服务端瞬时 5xx 更常见，直接放弃意味着
+# 整批跑完后还要人工重跑; 指数退避 (0.25s/0.5s/1s) 给服务端
+# 恢复窗口。只重试上传本身 —— 对象名由服务端随机生成，重复尝试
+# 不会产生冲突; 元数据创建不重试，缓存层已经短路了重复请求
+UPLOAD_RETRIES = 3
+
+# 整读/流式分界: 超过该大小的文件不再整体载入内存
+# 无损 FLAC 单曲可达 30-100 MB，8 路并发整读意味着峰值内存
+# 随文件大小线性膨胀; 流式上传把峰值压到 O(并发数 × 块大小)
+STREAM_THRESHOLD = 16 * 1024 * 1024
+
+# --- 持久化上传缓存 (断点续传) ---
+# 为什么需要: 重跑脚本会把整个曲库再传一遍。以
+# sha1(路径|mtime|大小) 为键记录已上传文件的 song_id，
+# 增量运行只处理新增/被修改的文件，耗时从 O(全部) 降为 O(新增)。
+# 所有读写都发生在事件循环线程上 (sqlite 点查是微秒级)，
+# 单线程访问天然满足 sqlite 连接的线程约束，无需加锁。
+CACHE_PATH = Path.home() / ".flowbeat" / "upload_cache.sqlite3"
+
+
+def _open_cache() -> sqlite3.Connection:
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(CACHE_PATH)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS uploaded (key TEXT PRIMARY KEY, song_id INTEGER)"
+    )
+    conn.commit()
+    return conn
+
+
+_cache = _open_cache()
+atexit.register(_cache.close)
+
+
+def _cache_key(file_path: Path, st: os.stat_result) -> str:
+    """文件指纹: 路径 + mtime + 大小，内容变动即视为新文件"""
+    return hashlib.sha1(
+        f"{file_path}|{st.st_mtime_ns}|{st.st_size}".encode()
+    ).hexdigest()
+
+
+# --- 进程内缓存 ---
+# 为什么缓存: 原逻辑每个文件都 GET 一次完整艺术家列表和专辑列表，
+# N 个文件就是 2N 次冗余往返，返回的还是同一份数据。
+# 两个 dict 在启动时/首次未命中时填充，创建成功后就地更新，
+# 之后所有文件的依赖解析都是纯内存查找。
+artist_by_name: dict[str, int] = {}
+# key: (artist_id, album_title) -> album_id
+album_by_key: dict[tuple[int, str], int] = {}
+# 已拉取过专辑列表的艺术家，避免重复 GET
+_albums_fetched: set[int] = set()
+
+# 按键加锁: 并发任务同时未命中同一艺术家/专辑时，
+# 只允许一个任务执行创建，其余等待后直接读缓存 —— 防止重复创建
+_creation_locks: dict[object, asyncio.Lock] = {}
+
+
+def _lock_for(key) -> asyncio.Lock:
+    lock = _creation_locks.get(key)
+    if lock is None:
+        lock = _creation_locks.setdefault(key, asyncio.Lock())
+    return lock
+
+
+async def resolve_artist(client: httpx.AsyncClient, artist_name: str) -> int | None:
+    """艺术家名 -> ID (缓存优先，未命中才创建)"""
+    artist_id = artist_by_name.get(artist_name)
+    if artist_id is not None:
+        return artist_id
+
+    async with _lock_for(("artist", artist_name)):
+        # 双重检查: 等锁期间其他任务可能已创建
+        artist_id = artist_by_name.get(artist_name)
+        if artist_id is not None:
+            return artist_id
+
+        log.info("  -> 创建艺术家: %s", artist_name)
+        new_art = await client.post("/music/artists", json={"name": artist_name})
+        if new_art.status_code != 200:
+            log.error("  创建艺术家失败: %s", new_art.text)
+            return None
+        artist_id = new_art.json()["id"]
+        artist_by_name[artist_name] = artist_id
+        return artist_id
+
+
+async def resolve_album(client: httpx.AsyncClient, artist_id: int, album_title: str) -> int | None:
+    """(艺术家, 专辑名) -> 专辑 ID (缓存优先，未命中才拉取/创建)"""
+    key = (artist_id, album_title)
+    album_id = album_by_key.get(key)
+    if album_id is not None:
+        return album_id
+
+    async with _lock_for(("album", key)):
+        album_id = album_by_key.get(key)
+        if album_id is not None:
+            return album_id
+
+        # 每个艺术家的专辑列表只拉一次
+        if artist_id not in _albums_fetched:
+            albums_resp = await client.get(f"/music/artists/{artist_id}/albums")
+            for album in albums_resp.json():
+                album_by_key[(artist_id, album["title"])] = album["id"]
+            _albums_fetched.add(artist_id)
+            album_id = album_by_key.get(key)
+            if album_id is not None:
+                return album_id
+
+        log.info("  -> 创建专辑: %s", album_title)
+        # 默认发行日期设为 2020-01-01
+        new_alb = await client.post("/music/albums", json={
+            "title": album_title,
+            "release_date": "2020-01-01",
+            "artist_id": artist_id
+        })
+        if new_alb.status_code != 200:
+            log.error("  创建专辑失败: %s", new_alb.text)
+            return None
+        album_id = new_alb.json()["id"]
+        album_by_key[key] = album_id
+        return album_id
+
+
+def parse_filename(file_path: Path) -> tuple[str, str]:
+    """
+    解析文件名: "Unstoppable_-_Sia.flac" -> (Unstoppable, Sia)
+    注意：这取决于你的文件名格式，此处根据截图假设为 Title_-_Artist.ext
+
+    partition 一次 C 层扫描同时完成 "包含判断 + 切分"，不分配
+    中间 list; 原先包裹的 try/except 在这条路径上永远不会触发，
+    纯属死分支，一并移除。
+    """
+    title_str, sep, artist_name = file_path.stem.partition("_-_")
+    if not sep:
+        return title_str.strip(), "未知艺术家"
+    return title_str.strip(), artist_name.strip() or "未知艺术家"
+
+
+async def _file_chunks(file_path: Path, chunk_size: int = 1 << 20):
+    """1 MiB 块的异步文件读取生成器 (httpx content= 直接消费)"""
+    fh = await asyncio.to_thread(open, file_path, "rb")
+    try:
+        while chunk := await asyncio.to_thread(fh.read, chunk_size):
+            yield chunk
+    finally:
+        fh.close()
+
+
+async def _send_with_retry(send):
+    """
+    有界重试的通用版本: send 是无参协程工厂，每次重试重新构造请求
+    (流式 body 的生成器只能消费一次，不可重放)。退避策略同
+    _post_with_retry。
+    """
+    for attempt in range(UPLOAD_RETRIES):
+        last = attempt == UPLOAD_RETRIES - 1
+        try:
+            resp = await send()
+        except httpx.TransportError:
+            if last:
+                raise
+        else:
+            if resp.status_code < 500 or last:
+                return resp
+        await asyncio.sleep(0.25 * (2 ** attempt))
+
+
+async def _post_with_retry(client: httpx.AsyncClient, url: str, *, data, files, reset=None):
+    """
+    带指数退避的有界重试 POST (见 UPLOAD_RETRIES 注释)
+
+    仅对瞬时故障重试: 传输层异常 (连接重置/超时) 和服务端 5xx。
+    4xx 是确定性错误，立即返回交由调用方报告。
+    reset 回调用于流式上传前把文件指针拨回开头。
+    """
+    for attempt in range(UPLOAD_RETRIES):
+        last = attempt == UPLOAD_RETRIES - 1
+        if reset is not None:
+            reset()
+        try:
+            resp = await client.post(url, data=data, files=files)
+        except httpx.TransportError:
+            if last:
+                raise
+        else:
+            if resp.status_code < 500 or last:
+                return resp
+        await asyncio.sleep(0.25 * (2 ** attempt))
+
+
+async def process_file(client: httpx.AsyncClient,
+                       file_path: Path, title_str: str, album_id: int):
+    """单个文件的上传 (艺术家/专辑已在预解析阶段完成，这里只剩热路径)"""
+    # 断点续传: 指纹命中说明此文件在之前的运行中已成功上传
+    st = await asyncio.to_thread(file_path.stat)
+    cache_key = _cache_key(file_path, st)
+    row = _cache.execute(
+        "SELECT song_id FROM uploaded WHERE key = ?", (cache_key,)
+    ).fetchone()
+    if row is not None:
+        log.info("已上传过，跳过: %s (ID: %s)", file_path.name, row[0])
+        return
+
+    log.info("正在上传: %s", file_path.name)
+
+    # 本地读 FLAC 头取真实时长，替代硬编码的 200 秒
+    # mutagen 只解析 STREAMINFO 块 (毫秒级)，省去服务端对整个
+    # 音频做探测; to_thread 让标签解析不阻塞事件循环，
+    # 并发任务间的解析还能摊到多核上
+    try:
+        info = await asyncio.to_thread(lambda: FLAC(str(file_path)).info)
+        duration = int(info.length)
+    except Exception as e:
+        log.warning("  读取时长失败，回退默认值: %s", e)
+        duration = 200
+
+    data = {
+        "title": title_str,
+        "duration": duration,
+        "album_id": album_id,
+        "track_number": 1
+    }
+
+    # 优先走原始字节流 PUT /music/upload/raw:
+    # multipart 框架要求两端都做 boundary 编码/扫描并多拷贝一次
+    # 数据，单文件上传场景纯属开销。raw 通道把元数据放进查询参数，
+    # 请求体就是音频字节，1 MiB 块边读边发。旧版服务端没有该路由
+    # (404/405) 时退回下面的 multipart 路径
+    params = {
+        "title": title_str,
+        "duration": duration,
+        "album_id": album_id,
+        "track_number": 1,
+        "filename": file_path.name,
+    }
+    upload_resp = await _send_with_retry(lambda: client.put(
+        "/music/upload/raw",
+        params=params,
+        content=_file_chunks(file_path),
+        headers={"Content-Type": "audio/flac"},
+    ))
+    if upload_resp.status_code not in (404, 405):
+        if upload_resp.status_code == 200:
+            song_id = upload_resp.json()["id"]
+            _cache.execute(
+                "INSERT OR REPLACE INTO uploaded (key, song_id) VALUES (?, ?)",
+                (cache_key, song_id),
+            )
+            _cache.commit()
+            log.info("  上传成功! ID: %s", song_id)
+        else:
+            log.error("  上传失败: %s", upload_resp.text)
+        return
+
+    # multipart 回退通道，按体积选择上传方式:
+    # - 小文件: to_thread 一次读入 bytes，避免同步 read() 阻塞
+    #   事件循环，且整块发送减少 write 次数
+    # - 大文件 (> STREAM_THRESHOLD): 直接把文件对象交给 httpx
+    #   的 multipart 流式编码，逐 64 KiB 块边读边发 ——
+    #   峰值内存从 O(并发数 × 文件大小) 降为 O(并发数 × 块大小);
+    #   小块磁盘读是微秒级，对事件循环的占用可以忽略
+    if st.st_size > STREAM_THRESHOLD:
+        fh = await asyncio.to_thread(open, file_path, "rb")
+        try:
+            # mmap 替代逐块 read(): read() 每块都要一次系统调用，
+            # 并把数据从页缓存拷进用户态 bytes; mmap 把页缓存直接
+            # 映射进地址空间，httpx 分块消费时由缺页按需取页，
+            # OS 顺带做顺序预读 —— 省掉整个文件体量的用户态拷贝。
+            # 64 位地址空间下 并发数 × 文件大小 的映射量不是问题
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                files = {'file': (file_path.name, mm, 'audio/flac')}
+                upload_resp = await _post_with_retry(
+                    client, "/music/upload", data=data, files=files,
+                    reset=lambda: mm.seek(0),
+                )
+            finally:
+                mm.close()
+        finally:
+            fh.close()
+    else:
+        body = await asyncio.to_thread(file_path.read_bytes)
+        files = {'file': (file_path.name, body, 'audio/flac')}
+        upload_resp = await _post_with_retry(client, "/music/upload", data=data, files=files)
+
+    if upload_resp.status_code == 200:
+        song_id = upload_resp.json()["id"]
+        _cache.execute(
+            "INSERT OR REPLACE INTO uploaded (key, song_id) VALUES (?, ?)",
+            (cache_key, song_id),
+        )
+        _cache.commit()
+        log.info("  上传成功! ID: %s", song_id)
+    else:
+        log.error("  上传失败: %s", upload_resp.text)
+
 
 async def main():
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    # 全程复用单个客户端:
+    # - http2=True: 大量小的元数据请求复用一条 TCP 连接多路复用，
+    #   免去逐请求的连接建立/队头阻塞 (需要 httpx[http2] 的 h2 依赖)
+    # - 连接池调到 64，确保 gather 并发下不会 PoolTimeout
+    # - 超时按阶段拆分: 建连 5s 快速失败，读写 60s 容纳大文件传输
+    # - base_url 消除每次调用的 URL 拼接
+    limits = httpx.Limits(max_connections=64, max_keepalive_connections=64)
+    timeout = httpx.Timeout(connect=5.0, read=60.0, write=60.0, pool=None)
+    async with httpx.AsyncClient(
+        base_url=API_BASE, http2=True, limits=limits, timeout=timeout
+    ) as client:
         # 1. 登录获取 Token
-        print(f"正在登录 {USERNAME}...")
-        resp = await client.post(f"{API_BASE}/auth/login/access-token", data={
+        log.info("正在登录 %s...", USERNAME)
+        resp = await client.post("/auth/login/access-token", data={
             "username": USERNAME,
             "password": PASSWORD
         })
         if resp.status_code != 200:
-            print(f"登录失败: {resp.text}")
+            log.error("登录失败: %s", resp.text)
             return
 
         token = resp.json()["access_token"]
-        headers = {"Authorization": f"Bearer {token}"}
-        print("登录成功！")
+        # Token 挂到客户端默认头上，后续所有调用免传 headers=
+        client.headers["Authorization"] = f"Bearer {token}"
+        log.info("登录成功！")
 
-        # 2. 遍历文件
-        folder = Path(MUSIC_DIR)
-        for file_path in folder.glob("*.flac"):
-            print(f"\n正在处理: {file_path.name}")
+        # 2. 预热艺术家缓存: 一次全量 GET 替代原先每文件一次的列表拉取
+        artists_resp = await client.get("/music/artists")
+        for artist in artists_resp.json():
+            artist_by_name[artist["name"]] = artist["id"]
 
-            # 解析文件名: "Unstoppable_-_Sia.flac" -> Title: Unstoppable, Artist: Sia
-            # 注意：这取决于你的文件名格式，此处根据截图假设为 Title_-_Artist.ext
-            try:
-                stem = file_path.stem  # 去掉后缀
-                if "_-_" in stem:
-                    parts = stem.split("_-_")
-                    title_str = parts[0].strip()
-                    artist_name = parts[1].strip()
-                else:
-                    title_str = stem
-                    artist_name = "未知艺术家"
-            except Exception:
-                title_str = file_path.stem
-                artist_name = "未知艺术家"
-
-            # 3. 检查或创建艺术家
-            # 简化逻辑：这里不做去重查询，直接尝试创建，如果已存在（唯一索引冲突）则需要查询ID
-            # 为演示简单，假设每次都查一下列表
-            artists_resp = await client.get(f"{API_BASE}/music/artists", headers=headers)
-            artists = artists_resp.json()
-            artist_id = next((a["id"] for a in artists if a["name"] == artist_name), None)
-
-            if not artist_id:
-                print(f"  -> 创建艺术家: {artist_name}")
-                new_art = await client.post(f"{API_BASE}/music/artists", json={"name": artist_name}, headers=headers)
-                if new_art.status_code != 200:
-                    print(f"  [Error] 创建艺术家失败: {new_art.text}")
-                    continue
-                artist_id = new_art.json()["id"]
-            else:
-                print(f"  -> 艺术家已存在: {artist_name} (ID: {artist_id})")
-
-            # 4. 检查或创建专辑 (默认创建一个同名专辑或通用专辑)
-            album_title = f"{artist_name}的热门单曲"
-            # 同样简化逻辑，获取该艺术家的专辑
-            albums_resp = await client.get(f"{API_BASE}/music/artists/{artist_id}/albums", headers=headers)
-            albums = albums_resp.json()
-            album_id = next((a["id"] for a in albums if a["title"] == album_title), None)
-
-            if not album_id:
-                print(f"  -> 创建专辑: {album_title}")
-                # 默认发行日期设为 2020-01-01
-                new_alb = await client.post(f"{API_BASE}/music/albums", json={
-                    "title": album_title,
-                    "release_date": "2020-01-01",
-                    "artist_id": artist_id
-                }, headers=headers)
-                if new_alb.status_code != 200:
-                    print(f"  [Error] 创建专辑失败: {new_alb.text}")
-                    continue
-                album_id = new_alb.json()["id"]
+        # 3. 预扫描: 一次遍历提取全部唯一依赖 (艺术家/专辑)，
+        # 分两道并行屏障批量创建。原逻辑把依赖解析穿插在上传里，
+        # N 个文件就是 N 条 "查-建-传" 串行链; 现在不管 N 多大，
+        # 依赖解析固定为两轮并行往返，上传阶段只剩纯热路径。
+        # os.scandir 替代 Path.glob: glob 为每个条目构造 Path 并额外
+        # stat 一次; scandir 直接消费 readdir 返回的 dirent (类型信息
+        # 顺带可得，is_file 无需补 stat)，万级曲库目录下枚举开销可忽略
+        with os.scandir(MUSIC_DIR) as it:
+            paths = [
+                Path(entry.path)
+                for entry in it
+                if entry.is_file(follow_symlinks=False) and entry.name.lower().endswith(".flac")
+            ]
+        files = [(file_path, *parse_filename(file_path)) for file_path in paths]
+
+        # 专辑标题按艺术家预计算: 标题由艺术家名确定性推导，
+        # 同一艺术家的所有文件共享同一个字符串对象，后续两处查找
+        # 不再逐文件跑 f-string 分配
+        album_title_by_artist = {
+            artist_name: f"{artist_name}的热门单曲"
+            for _, _, artist_name in files
+        }
+
+        # 第一道屏障: 批量补齐缺失的艺术家
+        # 优先走 /artists/bulk: 所有缺失项打包成一次请求，N 个往返
+        # 压缩为 1 个; 旧版服务端没有该端点时 (404) 退回并行单条创建
+        missing_artists = sorted({artist_name for _, _, artist_name in files} - artist_by_name.keys())
+        if missing_artists:
+            bulk_resp = await client.post(
+                "/music/artists/bulk",
+                json=[{"name": name} for name in missing_artists],
+            )
+            if bulk_resp.status_code == 200:
+                for artist in bulk_resp.json():
+                    artist_by_name[artist["name"]] = artist["id"]
             else:
-                print(f"  -> 专辑已存在 (ID: {album_id})")
-
-            # 5. 上传文件
-            print(f"  -> 开始上传文件...")
-            files = {'file': (file_path.name, open(file_path, 'rb'), 'audio/flac')}
-            data = {
-                "title": title_str,
-                "duration": 200,  # 这里的时长暂时硬编码，实际应使用 mutagen 库读取 FLAC 时长
-                "album_id": album_id,
-                "track_number": 1
-            }
-
-            upload_resp = await client.post(f"{API_BASE}/music/upload", data=data, files=files, headers=headers)
-
-            if upload_resp.status_code == 200:
-                print(f"  [Success] 上传成功! ID: {upload_resp.json()['id']}")
+                await asyncio.gather(*[
+                    resolve_artist(client, name) for name in missing_artists
+                ])
+
+        # 第二道屏障: 批量补齐缺失的专辑 (依赖艺术家 ID)
+        # 先并行预取涉及艺术家的既有专辑填入缓存 —— bulk 通道是
+        # 盲插，不先对账的话重跑脚本 (或首跑已有数据的服务端)
+        # 会把每张专辑重复创建一遍，断点续传的幂等性就破功了
+        involved_artist_ids = {
+            artist_by_name[artist_name]
+            for _, _, artist_name in files
+            if artist_name in artist_by_name
+        }
+
+        async def _prefetch_albums(artist_id: int):
+            albums_resp = await client.get(f"/music/artists/{artist_id}/albums")
+            for album in albums_resp.json():
+                album_by_key[(artist_id, album["title"])] = album["id"]
+            _albums_fetched.add(artist_id)
+
+        await asyncio.gather(*[
+            _prefetch_albums(artist_id)
+            for artist_id in involved_artist_ids - _albums_fetched
+        ])
+
+        needed_albums = {
+            (artist_by_name[artist_name], album_title_by_artist[artist_name])
+            for _, _, artist_name in files
+            if artist_name in artist_by_name  # 艺术家创建失败的文件跳过
+        }
+        missing_albums = sorted(needed_albums - album_by_key.keys())
+        if missing_albums:
+            bulk_resp = await client.post(
+                "/music/albums/bulk",
+                json=[
+                    {"title": title, "release_date": "2020-01-01", "artist_id": artist_id}
+                    for artist_id, title in missing_albums
+                ],
+            )
+            if bulk_resp.status_code == 200:
+                for album in bulk_resp.json():
+                    album_by_key[(album["artist_id"], album["title"])] = album["id"]
             else:
-                print(f"  [Fail] 上传失败: {upload_resp.text}")
+                await asyncio.gather(*[
+                    resolve_album(client, artist_id, album_title)
+                    for artist_id, album_title in missing_albums
+                ])
+
+        # 4. 生产者/消费者流水线上传 (album_id 已预解析，随队列项传入)
+        # 为什么不再用扁平 gather: 一次性实例化 N 个任务对象，
+        # 内存随曲库规模线性增长。有界队列 + 固定数量 worker 把
+        # 在制品数量钉死在 队列容量 + worker 数，十万级曲库下内存
+        # 依然平坦; worker 数本身就是并发上限，原先的信号量随之退役。
+        # 队列满时生产者自然阻塞 (背压)，目录扫描不会跑在上传前面太远
+        queue: asyncio.Queue = asyncio.Queue(maxsize=64)
+        stats = {"skipped": 0, "failed": 0}
+
+        async def producer():
+            for file_path, title_str, artist_name in files:
+                artist_id = artist_by_name.get(artist_name)
+                album_id = album_by_key.get((artist_id, album_title_by_artist[artist_name])) if artist_id else None
+                if album_id is None:
+                    log.warning("依赖解析失败，跳过: %s", file_path.name)
+                    stats["skipped"] += 1
+                    continue
+                await queue.put((file_path, title_str, album_id))
+            # 毒丸: 每个 worker 收到 None 后退出
+            for _ in range(CONCURRENCY):
+                await queue.put(None)
+
+        async def worker():
+            while (item := await queue.get()) is not None:
+                file_path, title_str, album_id = item
+                try:
+                    await process_file(client, file_path, title_str, album_id)
+                except Exception as e:
+                    stats["failed"] += 1
+                    log.error("  处理异常 %s: %r", file_path.name, e)
+
+        await asyncio.gather(producer(), *[worker() for _ in range(CONCURRENCY)])
 
-            # 关闭文件句柄
-            files['file'][1].close()
+        if stats["skipped"]:
+            log.warning("%s 个文件因依赖解析失败被跳过", stats["skipped"])
+        if stats["failed"]:
+            log.warning("%s 个文件处理异常", stats["failed"])
 
 
 if __name__ == "__main__":